@@ -0,0 +1,278 @@
+"""Benchmarks for the split, merge, rotate and preview hot paths.
+
+    python -m benchmarks.bench run [--quick] [--output report.json]
+    python -m benchmarks.bench compare old.json new.json [--threshold 1.25]
+
+Every case runs in a fresh subprocess against synthetic PDFs from
+benchmarks.fixtures, so its peak RSS is its own. Reports are JSON and can
+be kept per commit; compare exits with status 1 when a case got slower or
+bigger than the threshold allows.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .fixtures import SIZES, fixture_path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_FIXTURES = Path(tempfile.gettempdir()) / 'hotwheelspdf-bench-fixtures'
+
+# Cases: name -> (setup function, fixtures it runs on). A setup function
+# takes (fixture path, scratch folder) and returns the callable to time.
+
+def setup_parse_page_range(path, workdir):
+    from hotwheelspdf.core.ranges import parse_page_range, parse_split_spec, pages_to_range_str
+    total = _page_count(path)
+    # Thousands of short runs, the worst case for a hand-typed range
+    spec = ','.join(f'{page}-{page + 1}' for page in range(1, total, 3))
+    burst = f'1-{total // 2},~{total // 2 + 1}-{total}'
+
+    def run():
+        for _ in range(20):
+            pages_to_range_str(parse_page_range(spec, total))
+            parse_split_spec(burst, total)
+    return run
+
+def setup_page_checkboxes(path, workdir):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    from hotwheelspdf.core.document import PDFDocument
+    from hotwheelspdf.widgets.page_selector import PageSelectionModel, PageSelectorView
+    app = QApplication.instance() or QApplication([])
+    document = PDFDocument(str(path))
+
+    def run():
+        model = PageSelectionModel()
+        view = PageSelectorView()
+        view.setModel(model)
+        view.resize(300, 600)
+        view.show()
+        model.set_document(document)
+        model.set_range_checked(0, document.page_count - 1, True)
+        app.processEvents()
+        view.close()
+    return run
+
+def setup_preview_render(path, workdir):
+    from hotwheelspdf.core.document import PDFDocument
+    document = PDFDocument(str(path))
+
+    def run():
+        for page_index in range(min(document.page_count, 10)):
+            document.render(page_index, fit=(800, 1000))
+    return run
+
+def setup_split(path, workdir):
+    from hotwheelspdf.core.split import split_file
+    total = _page_count(path)
+    return lambda: split_file(str(path), f'1-{max(1, total // 2)}', workdir)
+
+def setup_split_burst(path, workdir):
+    from hotwheelspdf.core.split import split_file
+    total = _page_count(path)
+    return lambda: split_file(str(path), f'~1-{min(total, 200)}', workdir)
+
+def setup_merge(engine):
+    def setup(path, workdir):
+        from hotwheelspdf.core.merge import MERGE_ENGINES
+        output_path = os.path.join(workdir, 'merged.pdf')
+        return lambda: MERGE_ENGINES[engine]([str(path), str(path)], output_path)
+    return setup
+
+def setup_rotate(mode):
+    def setup(path, workdir):
+        from hotwheelspdf.core.rotate import rotate_file
+        return lambda: rotate_file(str(path), 90, 'odd', workdir, mode)
+    return setup
+
+ALL_FIXTURES = tuple(SIZES)
+
+CASES = {
+    'parse_page_range': (setup_parse_page_range, ('many_small',)),
+    'page_checkboxes': (setup_page_checkboxes, ('many_small', 'deep_tree')),
+    'preview_render': (setup_preview_render, ALL_FIXTURES),
+    'split': (setup_split, ALL_FIXTURES),
+    'split_burst': (setup_split_burst, ALL_FIXTURES),
+    'merge_pymupdf': (setup_merge('pymupdf'), ALL_FIXTURES),
+    'merge_pypdf2': (setup_merge('pypdf2'), ALL_FIXTURES),
+    'rotate_full': (setup_rotate('full'), ALL_FIXTURES),
+    'rotate_incremental': (setup_rotate('incremental'), ALL_FIXTURES),
+}
+
+def _page_count(path):
+    import fitz  # PyMuPDF
+    doc = fitz.open(str(path))
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None where unknown"""
+    # On Linux ru_maxrss survives exec, so a subprocess would inherit the
+    # peak of the process that forked it; VmHWM starts afresh
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, the BSDs kilobytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def run_case(name, path, workdir):
+    """Time one case in this process and return its measurements"""
+    setup, _ = CASES[name]
+    run = setup(path, workdir)
+    setup_rss = peak_rss_mb()
+    started = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - started
+    return {'seconds': round(seconds, 4), 'peak_rss_mb': peak_rss_mb(),
+            'setup_peak_rss_mb': setup_rss}
+
+def measure(name, path, repeat):
+    """Run a case `repeat` times in subprocesses; keep the best time and worst memory"""
+    best = None
+    for _ in range(repeat):
+        workdir = tempfile.mkdtemp(prefix='hotwheelspdf-bench-')
+        try:
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench', 'case', name, str(path), workdir],
+                cwd=str(ROOT), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                universal_newlines=True)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        if output.returncode != 0:
+            return {'error': output.stderr.strip().splitlines()[-1:] or ['failed']}
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        if best is None:
+            best = result
+        else:
+            best['seconds'] = min(best['seconds'], result['seconds'])
+            if result['peak_rss_mb'] is not None:
+                best['peak_rss_mb'] = max(best['peak_rss_mb'], result['peak_rss_mb'])
+    return best
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'describe', '--always', '--dirty'], cwd=str(ROOT),
+                                       stderr=subprocess.DEVNULL, universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_all(args):
+    import fitz  # PyMuPDF
+    selected = args.cases or list(CASES)
+    unknown = [name for name in selected if name not in CASES]
+    if unknown:
+        sys.exit(f'Unknown cases: {", ".join(unknown)}')
+    report = {
+        'commit': git_commit(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'quick': args.quick,
+        'repeat': args.repeat,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pymupdf': fitz.VersionBind,
+        'results': {},
+    }
+    for name in selected:
+        for fixture in CASES[name][1]:
+            path = fixture_path(args.fixtures, fixture, args.quick)
+            key = f'{name}/{fixture}'
+            result = measure(name, path, args.repeat)
+            report['results'][key] = result
+            if 'error' in result:
+                print(f'{key:<36} FAILED {result["error"][0]}', file=sys.stderr)
+            else:
+                print(f'{key:<36} {result["seconds"]:>9.3f} s {result["peak_rss_mb"] or 0:>8.1f} MB',
+                      file=sys.stderr)
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+def compare(args):
+    """Print old vs new per case; exit 1 if anything regressed past the threshold"""
+    with open(args.old) as f:
+        old = json.load(f)['results']
+    with open(args.new) as f:
+        new = json.load(f)['results']
+
+    regressions = 0
+    for key in sorted(set(old) | set(new)):
+        before, after = old.get(key), new.get(key)
+        if not before or not after or 'error' in before or 'error' in after:
+            print(f'{key:<36} {"missing or failed":>30}')
+            continue
+        line = f'{key:<36}'
+        for field, floor in (('seconds', args.min_seconds), ('peak_rss_mb', 0)):
+            a, b = before.get(field), after.get(field)
+            if a is None or b is None:
+                continue
+            ratio = b / a if a else 1.0
+            # Timings this short are mostly noise
+            regressed = ratio > args.threshold and b >= floor
+            regressions += regressed
+            line += f' {field} {a:.3f} -> {b:.3f} ({ratio:.2f}x){" REGRESSED" if regressed else ""}'
+        print(line)
+    sys.exit(1 if regressions else 0)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench',
+                                     description='Benchmark HotwheelsPDF hot paths.')
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmarks and write a JSON report')
+    run_parser.add_argument('cases', nargs='*',
+                            help='Cases to run (default: all): ' + ', '.join(CASES))
+    run_parser.add_argument('--quick', action='store_true', help='Use small fixtures')
+    run_parser.add_argument('--repeat', type=int, default=3,
+                            help='Runs per case; the fastest is kept (default: 3)')
+    run_parser.add_argument('--output', help='Report file (default: print it)')
+    run_parser.add_argument('--fixtures', default=str(DEFAULT_FIXTURES),
+                            help='Folder for the generated PDFs (default: %(default)s)')
+    run_parser.set_defaults(handler=run_all)
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two reports')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=1.25,
+                                help='Ratio above which a case counts as a regression (default: 1.25)')
+    compare_parser.add_argument('--min-seconds', type=float, default=0.05,
+                                help='Ignore slowdowns of cases faster than this (default: 0.05)')
+    compare_parser.set_defaults(handler=compare)
+
+    # Internal: run a single case in this process, used by `run`
+    case_parser = subparsers.add_parser('case')
+    case_parser.add_argument('name', choices=sorted(CASES))
+    case_parser.add_argument('path')
+    case_parser.add_argument('workdir')
+    case_parser.set_defaults(handler=lambda args: print(json.dumps(
+        run_case(args.name, args.path, args.workdir))))
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        sys.exit(2)
+    args.handler(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import random
+from pathlib import Path
+import fitz  # PyMuPDF
+
+# Bump when a generator changes, so stale fixtures are rebuilt
+FIXTURE_VERSION = 1
+
+# Fixture sizes: name -> (full size, quick size)
+SIZES = {
+    'many_small': (5000, 500),   # pages of text
+    'few_huge': (4, 2),          # A0 pages full of vector lines
+    'scans': (40, 6),            # pages holding a noisy grayscale image
+    'deep_tree': (2048, 256),    # pages under a binary page tree
+}
+
+def fixture_path(folder, name, quick=False):
+    """Path of a synthetic PDF, generating it first if it doesn't exist"""
+    size = SIZES[name][1 if quick else 0]
+    path = Path(folder) / f'{name}_{size}_v{FIXTURE_VERSION}.pdf'
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix('.tmp')
+        GENERATORS[name](temp_path, size)
+        temp_path.replace(path)
+    return path
+
+def many_small(path, pages):
+    doc = fitz.open()
+    for page_num in range(1, pages + 1):
+        page = doc.new_page()
+        page.insert_text((72, 72), f'Page {page_num}', fontsize=24)
+        page.insert_text((72, 110), 'The quick brown fox jumps over the lazy dog. ' * 2, fontsize=9)
+    doc.save(str(path), garbage=1, deflate=True)
+    doc.close()
+
+def few_huge(path, pages, lines=50000):
+    # Short strokes all over the page, like a CAD drawing
+    rng = random.Random(1)
+    doc = fitz.open()
+    for page_num in range(1, pages + 1):
+        page = doc.new_page(width=2384, height=3370)
+        shape = page.new_shape()
+        for _ in range(lines):
+            x, y = rng.uniform(0, 2384), rng.uniform(0, 3370)
+            shape.draw_line((x, y), (x + rng.uniform(-40, 40), y + rng.uniform(-40, 40)))
+        shape.finish(width=0.3, color=(0, 0, 0))
+        shape.commit()
+        page.insert_text((72, 144), f'Page {page_num}', fontsize=96)
+    doc.save(str(path), deflate=True)
+    doc.close()
+
+def scans(path, pages, width=1240, height=1754):
+    # Noise doesn't compress, so each page carries a full size image like a real scan
+    rng = random.Random(2)
+    doc = fitz.open()
+    for page_num in range(1, pages + 1):
+        page = doc.new_page()
+        samples = rng.getrandbits(8 * width * height).to_bytes(width * height, 'little')
+        pixmap = fitz.Pixmap(fitz.csGRAY, width, height, samples, False)
+        page.insert_image(page.rect, pixmap=pixmap)
+        page.insert_text((72, 72), f'Page {page_num}', fontsize=24)
+    doc.save(str(path))
+    doc.close()
+
+def deep_tree(path, pages, fanout=2):
+    doc = fitz.open()
+    for page_num in range(1, pages + 1):
+        doc.new_page().insert_text((72, 72), f'Page {page_num}', fontsize=24)
+    # Rebuild the flat page tree as a balanced tree with `fanout` kids per node
+    root = int(doc.xref_get_key(doc.pdf_catalog(), 'Pages')[1].split()[0])
+    level = [(doc.page_xref(i), 1) for i in range(pages)]
+    while len(level) > fanout:
+        parents = []
+        for i in range(0, len(level), fanout):
+            kids = level[i:i + fanout]
+            xref = doc.get_new_xref()
+            kid_refs = ' '.join(f'{kid} 0 R' for kid, _ in kids)
+            count = sum(kid_count for _, kid_count in kids)
+            doc.update_object(xref, f'<< /Type /Pages /Kids [{kid_refs}] /Count {count} >>')
+            for kid, _ in kids:
+                doc.xref_set_key(kid, 'Parent', f'{xref} 0 R')
+            parents.append((xref, count))
+        level = parents
+    doc.xref_set_key(root, 'Kids', '[' + ' '.join(f'{kid} 0 R' for kid, _ in level) + ']')
+    for kid, _ in level:
+        doc.xref_set_key(kid, 'Parent', f'{root} 0 R')
+    doc.save(str(path), garbage=1)
+    doc.close()
+
+GENERATORS = {
+    'many_small': many_small,
+    'few_huge': few_huge,
+    'scans': scans,
+    'deep_tree': deep_tree,
+}
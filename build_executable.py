@@ -1,4 +1,5 @@
 import PyInstaller.__main__
+import argparse
 import os
 import platform
 from PIL import Image
@@ -55,7 +56,14 @@ def convert_to_ico(png_path, workpath):
         return ico_path
     return None
 
-def build():
+def build(onedir=False, splash=False):
+    """Build the executable with PyInstaller.
+
+    onedir builds a folder instead of a single file. It starts much faster,
+    because a single file executable unpacks itself to a temporary folder
+    on every launch. splash shows the logo while the executable starts;
+    PyInstaller supports it on Windows and Linux only.
+    """
     # Get the directory containing images
     images_dir = os.path.join('hotwheelspdf', 'images')
     icon_path = os.path.join(images_dir, 'LogoBackground01.png')
@@ -90,7 +98,7 @@ def build():
     args = [
         'run.py',
         '--name=HotwheelsPDF',
-        '--onefile',
+        '--onedir' if onedir else '--onefile',
         '--windowed',
         f'--icon={icon_arg}',
         '--clean',
@@ -101,9 +109,21 @@ def build():
     
     # Add data arguments
     args.extend(data_args)
+
+    if splash:
+        if platform.system() == 'Darwin':
+            print("Splash screens are not supported on macOS; building without one")
+        else:
+            args.append(f'--splash={icon_path}')
     
     print("Building with arguments:", args)
     PyInstaller.__main__.run(args)
 
 if __name__ == '__main__':
-    build()
+    parser = argparse.ArgumentParser(description='Build the HotwheelsPDF executable.')
+    parser.add_argument('--onedir', action='store_true',
+                        help='Build a folder instead of a single file, for faster startup')
+    parser.add_argument('--splash', action='store_true',
+                        help='Show the logo while the executable starts (Windows and Linux)')
+    args = parser.parse_args()
+    build(args.onedir, args.splash)
@@ -0,0 +1,118 @@
+import argparse
+import json
+import sys
+import time
+
+def run_split(args):
+    from .core.split import iter_batch_split, split_file
+    from .utils.settings import Settings
+    workers = args.workers or Settings().get_worker_count()
+    if len(args.inputs) == 1:
+        return split_file(args.inputs[0], args.pages, args.output_dir, workers)
+
+    # Batch mode: one JSON line per file as it finishes, then a summary
+    failed = 0
+    for result in iter_batch_split(args.inputs, args.pages, args.output_dir, workers):
+        failed += 'error' in result
+        print(json.dumps(result), flush=True)
+    return {'files': len(args.inputs), 'failed': failed, 'workers': workers}
+
+def run_merge(args):
+    from .core.merge import MERGE_ENGINES
+    from .core.paths import default_export_folder, merged_output_path
+    from .core.probe import probe_pdfs, probe_problems
+    if len(args.inputs) < 2:
+        raise ValueError('Please select at least 2 PDF files to merge.')
+    if args.garbage and args.engine != 'pymupdf':
+        raise ValueError('--garbage only applies to the pymupdf engine.')
+    problems = probe_problems(probe_pdfs(args.inputs))
+    if problems:
+        raise ValueError('These files cannot be merged: ' + '; '.join(problems))
+    output_dir = default_export_folder(args.inputs, args.output_dir)
+    output_path = args.output or merged_output_path(args.inputs, output_dir)
+    if args.engine == 'pymupdf':
+        MERGE_ENGINES[args.engine](args.inputs, output_path, garbage=args.garbage)
+    else:
+        MERGE_ENGINES[args.engine](args.inputs, output_path)
+    return {'inputs': args.inputs, 'output': output_path, 'engine': args.engine}
+
+def run_rotate(args):
+    from .core.rotate import rotate_file
+    from .utils.settings import Settings
+    workers = args.workers or Settings().get_worker_count()
+    return rotate_file(args.input, args.angle, args.pages, args.output_dir,
+                       args.mode.replace('-', '_'), args.auto_orient, workers)
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='hotwheelspdf',
+        description='Split, merge and rotate PDFs. Starts the GUI when no command is given.')
+    parser.add_argument('--startup-timing', nargs='?', const='-', metavar='FILE',
+                        help='Start the GUI, write its startup timings as JSON to FILE '
+                             '(default: stdout) after the first paint, and quit')
+    subparsers = parser.add_subparsers(dest='command')
+
+    split_parser = subparsers.add_parser('split', help='Extract pages into a new PDF')
+    split_parser.add_argument('inputs', nargs='+',
+                              help='PDF to split; several files are split in parallel')
+    split_parser.add_argument('--pages', required=True,
+                              help='Page range, e.g. 1,3-5; ~ exports pages as separate files, e.g. ~1-10')
+    split_parser.add_argument('--output-dir', help='Export folder (default: next to the input)')
+    split_parser.add_argument('--workers', type=int,
+                              help='Worker processes for several files or separate pages (default: from settings)')
+    split_parser.set_defaults(handler=run_split)
+
+    merge_parser = subparsers.add_parser('merge', help='Merge PDFs in the given order')
+    merge_parser.add_argument('inputs', nargs='+', help='PDFs to merge')
+    merge_parser.add_argument('--output', help='Output file (default: named after the inputs)')
+    merge_parser.add_argument('--output-dir', help='Export folder (default: next to the first input)')
+    merge_parser.add_argument('--engine', choices=['pymupdf', 'pypdf2'], default='pymupdf',
+                              help='Merge engine (default: pymupdf)')
+    merge_parser.add_argument('--garbage', type=int, choices=range(5), default=0,
+                              help='PyMuPDF garbage collection level: 1 removes unused objects, '
+                                   '3 also merges duplicates, 4 also compares streams (default: 0)')
+    merge_parser.set_defaults(handler=run_merge)
+
+    rotate_parser = subparsers.add_parser('rotate', help='Rotate pages clockwise')
+    rotate_parser.add_argument('input', help='PDF to rotate')
+    rotate_parser.add_argument('--angle', type=int, default=90, help='Clockwise angle (default: 90)')
+    rotate_parser.add_argument('--pages', default='',
+                               help='Pages to rotate: all, odd, even or a range (default: all)')
+    rotate_parser.add_argument('--auto-orient', action='store_true',
+                               help='Ignore --angle and turn each page so its text is upright')
+    rotate_parser.add_argument('--workers', type=int,
+                               help='Worker processes for --auto-orient (default: from settings)')
+    rotate_parser.add_argument('--output-dir', help='Export folder (default: next to the input)')
+    rotate_parser.add_argument('--mode', choices=['full', 'incremental', 'in-place'], default='full',
+                               help='full rewrites the PDF; incremental appends only the changed '
+                                    'pages to a copy; in-place appends them to the input after '
+                                    'saving a .bak backup (default: full)')
+    rotate_parser.set_defaults(handler=run_rotate)
+
+    return parser
+
+def main(argv=None):
+    """Command line entry point.
+
+    Without a subcommand the GUI is started. The split, merge and rotate
+    subcommands run headless: they share the GUI's engine, page range
+    syntax and output naming, never import PyQt5, and print a JSON result.
+    """
+    started = time.perf_counter()
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        # Only the GUI needs Qt, so it is imported here and nowhere else
+        from .main import main as gui_main
+        gui_main(started, args.startup_timing)
+        return
+
+    try:
+        result = args.handler(args)
+    except Exception as e:
+        result = {'ok': False, 'error': str(e)}
+    else:
+        result = dict({'ok': True}, **result)
+    result['command'] = args.command
+    result['seconds'] = round(time.perf_counter() - started, 4)
+    print(json.dumps(result))
+    sys.exit(0 if result['ok'] else 1)
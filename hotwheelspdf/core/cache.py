@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+from ..utils.settings import Settings
+
+class PageCache:
+    """LRU cache of rendered pages bounded by total size in bytes.
+
+    Values are opaque to the cache; callers pass the size of each entry
+    when storing it. Safe to use from render worker threads.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key, value, nbytes):
+        """Store a value, evicting least recently used entries to fit"""
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            self._evict()
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.current_bytes -= nbytes
+
+def page_key(document, page_index, rotation=0, zoom=1.0):
+    """Cache key for a rendered page.
+
+    zoom is either a zoom factor or the (width, height) box the page was
+    fitted into, which determines the zoom just as well.
+    """
+    if not isinstance(zoom, tuple):
+        zoom = round(zoom, 3)
+    return (document.identity, page_index, rotation % 360, zoom)
+
+_shared_cache = None
+_thumbnail_cache = None
+
+def shared_page_cache():
+    """Return the application-wide page cache, sized from Settings"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = PageCache(Settings().get_render_cache_mb() * 1024 * 1024)
+    return _shared_cache
+
+def shared_thumbnail_cache():
+    """Return the application-wide cache of rendered thumbnails.
+
+    Thumbnails are small, so a modest budget holds thousands of them.
+    """
+    global _thumbnail_cache
+    if _thumbnail_cache is None:
+        _thumbnail_cache = PageCache(Settings().get_thumbnail_cache_mb() * 1024 * 1024)
+    return _thumbnail_cache
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from ..utils.settings import Settings
+
+# Bytes hashed at each end of a file to fingerprint it
+FINGERPRINT_BLOCK = 64 * 1024
+
+def user_cache_dir():
+    """Per-user cache folder for HotwheelsPDF"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    elif sys.platform == 'darwin':
+        base = Path.home() / 'Library' / 'Caches'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'HotwheelsPDF'
+
+def file_fingerprint(path):
+    """Cheap identity of a file's contents.
+
+    Size and modification time, plus a hash of the first and last blocks,
+    which is where PDF headers, trailers and incremental updates live.
+    Copies of a file share a fingerprint; any save changes it.
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_BLOCK))
+        if stat.st_size > FINGERPRINT_BLOCK:
+            f.seek(max(FINGERPRINT_BLOCK, stat.st_size - FINGERPRINT_BLOCK))
+            digest.update(f.read(FINGERPRINT_BLOCK))
+    return (stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+
+class DiskCache:
+    """Blobs stored as files under a directory, keyed by any repr-able key.
+
+    Writes go through a temporary file and a rename, so readers never see
+    a half written entry and concurrent writers can't corrupt one. Reads
+    bump an entry's modification time, and once the total size passes
+    max_bytes the least recently used entries are deleted. Measuring and
+    trimming the directory happen on a background thread, so a put never
+    waits for a walk of the whole cache. A cache that can't be read or
+    written simply misses.
+    """
+
+    def __init__(self, directory, max_bytes=None):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.current_bytes = None  # Unknown until the directory is first scanned
+        self._lock = threading.Lock()
+        self._trimming = False
+
+    def path_for(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return self.directory / digest[:2] / f'{digest}.cache'
+
+    def get(self, key):
+        """Return the stored bytes for key, or None"""
+        path = self.path_for(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            # Mark as recently used for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key, data):
+        path = self.path_for(key)
+        temp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error writing disk cache: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            if self.current_bytes is not None:
+                self.current_bytes += len(data) - replaced
+                if self.max_bytes is None or self.current_bytes <= self.max_bytes:
+                    return
+            self._start_trim()
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            if self.current_bytes is not None and self.current_bytes > max_bytes:
+                self._evict()
+
+    def clear(self):
+        """Delete every entry"""
+        with self._lock:
+            for path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.current_bytes = 0
+
+    def _start_trim(self):
+        # Called with _lock held; one background walk at a time
+        if self._trimming:
+            return
+        self._trimming = True
+        threading.Thread(target=self._trim, name='disk-cache-trim', daemon=True).start()
+
+    def _trim(self):
+        """Learn the cache's size if it isn't known yet, then evict down to the cap.
+
+        Writes made while the directory is scanned may be missed or counted
+        twice; the count is exact again after the next eviction.
+        """
+        total = self._scan_size() if self.current_bytes is None else None
+        with self._lock:
+            self._trimming = False
+            if total is not None:
+                self.current_bytes = total
+            if self.max_bytes is not None and self.current_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        if not self.directory.exists():
+            return []
+        return list(self.directory.glob('*/*.cache'))
+
+    def _scan_size(self):
+        total = 0
+        for path in self._entries():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict(self):
+        # Go down to 90% of the cap so the next few writes don't scan again
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 9 // 10
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self.current_bytes = total
+
+def load_document_meta(cache, fingerprint):
+    """Page count, label rules and page sizes stored for a fingerprint, or None"""
+    data = cache.get(('meta', fingerprint))
+    if data is None:
+        return None
+    try:
+        return json.loads(data.decode('utf-8'))
+    except ValueError:
+        return None
+
+def save_document_meta(cache, fingerprint, meta):
+    cache.put(('meta', fingerprint), json.dumps(meta).encode('utf-8'))
+
+_disk_cache = None
+
+def shared_disk_cache():
+    """Return the application-wide disk cache, or None if it is turned off.
+
+    It is sized from Settings and holds rendered thumbnails and document
+    metadata, keyed by file fingerprint so they survive restarts.
+    """
+    global _disk_cache
+    if _disk_cache is None:
+        megabytes = Settings().get_disk_cache_mb()
+        if megabytes <= 0:
+            return None
+        _disk_cache = DiskCache(user_cache_dir(), megabytes * 1024 * 1024)
+    return _disk_cache
@@ -0,0 +1,288 @@
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+import fitz  # PyMuPDF
+from .diskcache import file_fingerprint, load_document_meta, save_document_meta, shared_disk_cache
+from .extract import stream_pages
+from .labels import PageLabels
+from .mapped import open_document
+from .progress import check_cancelled, report
+from .ranges import PageRanges
+
+# Source files at least this big are split by streaming pages to the output
+# (see core.extract); smaller ones are copied faster with insert_pdf
+STREAM_THRESHOLD = 16 * 1024 * 1024
+
+class PDFDocument:
+    """A single open PyMuPDF handle for a PDF file, shared between screens.
+
+    Large files are read through a memory map (see core.mapped), so the
+    bytes live in the OS page cache rather than in this process.
+
+    Every use of the handle goes through the document's own lock, so
+    work on one file never waits for another. PyMuPDF holds the GIL for
+    the length of each call, so calls on different documents can't run
+    inside MuPDF at the same time; documents private to one thread, like
+    a merge's inputs and output, need no lock at all.
+    """
+
+    def __init__(self, path, meta_cache=None):
+        """Open path; with a DiskCache as meta_cache, the labels and page
+        sizes of a file seen before are read from the cache, not the PDF.
+        """
+        self.path = path
+        self.lock = threading.RLock()
+        self.extracting = 0  # extract_pages calls in progress
+        self.meta_cache = meta_cache
+        # Key that changes whenever the file on disk changes
+        self.identity = file_fingerprint(path)
+        meta = load_document_meta(meta_cache, self.identity) if meta_cache else None
+        with self.lock:
+            self.doc, self.mapped = open_document(path)
+            self.page_count = self.doc.page_count
+            if meta is not None and meta.get('page_count') != self.page_count:
+                meta = None
+            if meta is not None:
+                self.labels = PageLabels(meta['labels'], self.page_count)
+                self.page_sizes = meta['page_sizes']
+            else:
+                self.labels = PageLabels.from_document(self.doc)
+                self.page_sizes = [None] * self.page_count
+        # Written when the document is closed, not while the file is opening
+        self.meta_dirty = meta is None
+
+    def page_label(self, page_index):
+        """Return the page label for a page, or an empty string"""
+        return self.labels.label(page_index)
+
+    def page_size(self, page_index):
+        """Displayed [width, height] of a page in points, or None if unknown.
+
+        Sizes are learned as pages are rendered and kept in the metadata
+        cache, so this never has to load a page.
+        """
+        return self.page_sizes[page_index]
+
+    def save_meta(self):
+        """Store labels and known page sizes in the metadata cache"""
+        if self.meta_cache is None or not self.meta_dirty:
+            return
+        meta = {'page_count': self.page_count, 'labels': self.labels.rules,
+                'page_sizes': self.page_sizes}
+        save_document_meta(self.meta_cache, self.identity, meta)
+        self.meta_dirty = False
+
+    def render(self, page_index, zoom=1.0, rotation=0, fit=None, max_zoom=None):
+        """Render a page to a fitz.Pixmap.
+
+        rotation is applied on top of the page's own /Rotate, so screens can
+        preview pending rotations without touching the shared document.
+        fit is an optional (width, height) box in device pixels; when given
+        the zoom is chosen so the page just fills the box, but never above
+        max_zoom.
+        """
+        with self.lock:
+            page = self.doc[page_index]
+            if self.page_sizes[page_index] is None:
+                self.page_sizes[page_index] = [page.rect.width, page.rect.height]
+                self.meta_dirty = True
+            if fit is not None:
+                zoom = fit_zoom(page.rect.width, page.rect.height, fit, rotation)
+                if max_zoom is not None:
+                    zoom = min(zoom, max_zoom)
+            matrix = fitz.Matrix(zoom, zoom)
+            if rotation:
+                matrix.prerotate(rotation)
+            return page.get_pixmap(matrix=matrix)
+
+    def should_stream(self):
+        """Whether extract_pages streams instead of building the output in memory"""
+        if self.doc.is_encrypted or self.doc.metadata.get('encryption'):
+            return False
+        try:
+            return os.path.getsize(self.path) >= STREAM_THRESHOLD
+        except OSError:
+            return False
+
+    def extract_pages(self, page_indexes, output_path, progress=None, cancelled=None):
+        """Write the given 0-based pages to a new PDF at output_path.
+
+        page_indexes is a PageRanges or a sorted list. Pages of a large
+        file are streamed to the output object by object (see core.extract),
+        so memory doesn't grow with the size of the output. Small and
+        encrypted files are copied with insert_pdf, one call per run of
+        consecutive pages. Progress is reported in pages copied.
+        """
+        with self.lock:
+            stream = self.should_stream()
+            self.extracting += 1
+        # The lock is taken per page (or run of pages), so previews and
+        # thumbnails of this file keep rendering during a long extraction
+        try:
+            if stream:
+                stream_pages(self.doc, page_indexes, output_path, progress, cancelled, self.lock)
+                return
+            pages = PageRanges.from_pages(page_indexes)
+            total = len(pages)
+            output = fitz.open()
+            try:
+                for start, end in pages.runs():
+                    check_cancelled(cancelled)
+                    with self.lock:
+                        output.insert_pdf(self.doc, from_page=start, to_page=end)
+                    report(progress, output.page_count, total,
+                           f'Copied {output.page_count} of {total} pages')
+                output.save(output_path)
+            finally:
+                output.close()
+        finally:
+            with self.lock:
+                self.extracting -= 1
+
+    def save_rotated(self, output_path, rotations, incremental=False):
+        """Save a copy of the document with extra page rotations applied.
+
+        rotations maps 0-based page indexes to clockwise angles added to the
+        page's current /Rotate. The shared handle is restored afterwards so
+        other screens are unaffected.
+
+        With incremental=True the file is copied as-is and an update holding
+        only the changed page dictionaries is appended to the copy, instead
+        of rewriting every object. Files MuPDF had to repair can't be
+        updated that way and are saved in full.
+        """
+        with self.lock:
+            if incremental and self.doc.can_save_incrementally():
+                shutil.copyfile(self.path, output_path)
+                copy = fitz.open(output_path)
+                try:
+                    _apply_rotations(copy, rotations)
+                    copy.saveIncr()
+                finally:
+                    copy.close()
+                return
+
+            original = {}
+            try:
+                _apply_rotations(self.doc, rotations, original)
+                self.doc.save(output_path)
+            finally:
+                _apply_rotations(self.doc, original, absolute=True)
+
+    def save_rotated_in_place(self, rotations, backup_path=None):
+        """Apply rotations to the file itself as an incremental update.
+
+        Only the changed page dictionaries are appended to the file. The
+        shared handle is reopened afterwards so it shows the new rotations,
+        and identity is refreshed so cached renders of the old file are not
+        reused. backup_path, if given, receives a copy of the file before it
+        is changed.
+        """
+        with self.lock:
+            if self.extracting:
+                # Pages being split are read from the handle this reopens
+                raise ValueError('This PDF is being split; save again once the split has finished.')
+            if not self.doc.can_save_incrementally():
+                raise ValueError('This PDF cannot be updated in place; save a copy instead.')
+            if backup_path:
+                shutil.copyfile(self.path, backup_path)
+            # A memory-mapped handle can't write to its file, and the file
+            # can't grow under a live map everywhere, so update it through a
+            # handle of its own with the shared one closed
+            self.doc.close()
+            if self.mapped is not None:
+                self.mapped.close()
+            try:
+                target = fitz.open(self.path)
+                try:
+                    _apply_rotations(target, rotations)
+                    target.saveIncr()
+                finally:
+                    target.close()
+            finally:
+                self.doc, self.mapped = open_document(self.path)
+            self.identity = file_fingerprint(self.path)
+            for page_index in rotations:
+                self.page_sizes[page_index] = None
+            self.meta_dirty = True
+
+    def close(self):
+        self.save_meta()
+        with self.lock:
+            self.doc.close()
+            if self.mapped is not None:
+                self.mapped.close()
+
+def _apply_rotations(doc, rotations, original=None, absolute=False):
+    """Add clockwise rotations to pages of doc, or set them if absolute.
+
+    The previous rotation of each changed page is recorded in original.
+    """
+    for page_index, rotation in rotations.items():
+        page = doc[page_index]
+        if original is not None:
+            original[page_index] = page.rotation
+        page.set_rotation(rotation if absolute else (page.rotation + rotation) % 360)
+
+def fit_zoom(page_width, page_height, fit, rotation=0):
+    """Zoom factor that makes a page just fill a (width, height) box"""
+    if rotation % 180:
+        page_width, page_height = page_height, page_width
+    width, height = fit
+    if page_width <= 0 or page_height <= 0 or width < 1 or height < 1:
+        return 1.0
+    return min(width / page_width, height / page_height)
+
+class DocumentRegistry:
+    """Refcounted registry so each path is opened only once.
+
+    Documents opened here use the shared disk cache for their metadata.
+    """
+
+    def __init__(self):
+        self._documents = {}
+        self._refcounts = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, path):
+        """Return the shared PDFDocument for path, opening it if needed"""
+        key = os.path.realpath(path)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                document = PDFDocument(key, shared_disk_cache())
+                self._documents[key] = document
+                self._refcounts[key] = 0
+            self._refcounts[key] += 1
+            return document
+
+    def release(self, document):
+        """Drop one reference, closing the document when nobody uses it"""
+        if document is None:
+            return
+        with self._lock:
+            key = document.path
+            if key not in self._refcounts:
+                return
+            self._refcounts[key] -= 1
+            if self._refcounts[key] <= 0:
+                del self._refcounts[key]
+                del self._documents[key]
+                document.close()
+
+    @contextmanager
+    def open(self, path):
+        """Borrow a document for the duration of a with block"""
+        document = self.acquire(path)
+        try:
+            yield document
+        finally:
+            self.release(document)
+
+# Shared by every screen in the application
+registry = DocumentRegistry()
+
+def acquire_document(path, progress=None, cancelled=None):
+    """registry.acquire shaped like a core operation, so it can run as a Job"""
+    return registry.acquire(path)
@@ -0,0 +1,260 @@
+import re
+from contextlib import nullcontext
+from array import array
+from collections import deque
+from .progress import check_cancelled, report
+from .ranges import PageRanges
+
+# Indirect reference, e.g. 12 0 R
+_REF = re.compile(r'(?<![\d.])(\d+)\s+(\d+)\s+R(?![A-Za-z0-9_])')
+# A page's /Annots entry, inline or indirect
+_ANNOTS = re.compile(r'/Annots(?![A-Za-z0-9_])\s*(\[[^\]]*\]|\d+\s+\d+\s+R)')
+# A stream's own /Length, but not /Length1 and friends of font files
+_LENGTH = re.compile(r'/Length(?![A-Za-z0-9_])\s*(\d+\s+\d+\s+R|\d+)')
+# Where a literal or hex string may start; << is matched to skip dictionaries
+_STRING_START = re.compile(r'<<|[(<]')
+
+# Kinds of source objects that are never copied as they are
+PAGE = 1
+TREE_NODE = 2
+
+# Page attributes a page may inherit from its ancestors in the page tree
+INHERITABLE = ('Resources', 'MediaBox', 'CropBox', 'Rotate')
+
+def stream_pages(doc, page_indexes, output_path, progress=None, cancelled=None, lock=None):
+    """Write the given 0-based pages of a fitz.Document to a new PDF.
+
+    Objects are copied one at a time straight into the output file as
+    they are reached from the selected pages: stream data is copied raw,
+    without decoding, and an object shared by several pages (fonts,
+    images, ...) is written once. Besides the object being copied, only
+    a few bytes per object of the source are kept in memory, however many
+    pages are extracted. References to pages that are not extracted
+    become null. Encrypted documents must be extracted with insert_pdf
+    instead.
+
+    lock, if given, guards doc; it is taken for each page and released in
+    between, so other users of doc are only held up for a page at a time.
+    """
+    lock = lock or nullcontext()
+    pages = list(PageRanges.from_pages(page_indexes))
+    total = len(pages)
+    with lock:
+        page_xrefs = [doc.page_xref(i) for i in pages]
+        xref_count = doc.xref_length()
+        version = doc.metadata.get('format', '').replace('PDF ', '') or '1.7'
+
+        # Mark the source's pages and page tree, so references to them can
+        # be redirected instead of dragging in the whole document
+        kinds = bytearray(xref_count)
+        for i in range(doc.page_count):
+            kinds[doc.page_xref(i)] = PAGE
+        for xref in _page_tree_nodes(doc, page_xrefs):
+            kinds[xref] = TREE_NODE
+
+    catalog, root = 1, 2
+    numbers = array('q', bytes(8 * xref_count))  # source xref -> output number, 0 if not copied
+    offsets = array('q', bytes(8 * (xref_count + 3)))  # output number -> file offset
+    queue = deque()
+    inherited = {}  # (tree node, key) -> inherited value
+    count = 3  # Next output object number
+
+    for xref in page_xrefs:
+        numbers[xref] = count
+        count += 1
+
+    def renumber(match):
+        nonlocal count
+        xref = int(match.group(1))
+        if not 0 < xref < xref_count:
+            return 'null'
+        if kinds[xref] == TREE_NODE:
+            return f'{root} 0 R'
+        number = numbers[xref]
+        if not number:
+            if kinds[xref] == PAGE:
+                return 'null'
+            number = numbers[xref] = count
+            count += 1
+            queue.append(xref)
+        return f'{number} 0 R'
+
+    with open(output_path, 'wb') as f:
+        f.write(f'%PDF-{version}\n%\xe2\xe3\xcf\xd3\n'.encode('latin-1'))
+
+        def write_object(number, body, stream=None):
+            offsets[number] = f.tell()
+            f.write(f'{number} 0 obj\n'.encode('ascii'))
+            f.write(body.encode('latin-1'))
+            if stream is not None:
+                f.write(b'\nstream\n')
+                f.write(stream)
+                f.write(b'\nendstream')
+            f.write(b'\nendobj\n')
+
+        kids = ' '.join(f'{numbers[xref]} 0 R' for xref in page_xrefs)
+        write_object(catalog, f'<</Type/Catalog/Pages {root} 0 R>>')
+        write_object(root, f'<</Type/Pages/Kids[{kids}]/Count {total}>>')
+
+        for done, xref in enumerate(page_xrefs):
+            check_cancelled(cancelled)
+            with lock:
+                body = _with_inherited(doc, xref, doc.xref_object(xref, compressed=True, ascii=True), inherited)
+                body = _without_dead_links(doc, xref, body, lambda target: 0 < target < xref_count and numbers[target] != 0)
+                write_object(numbers[xref], _rewrite(body, renumber))
+                # Copy everything this page needs before the next page, so
+                # the queue never holds more than one page's resources
+                while queue:
+                    source = queue.popleft()
+                    _copy_object(doc, source, numbers[source], renumber, write_object)
+            report(progress, done + 1, total, f'Copied {done + 1} of {total} pages')
+
+        # Classic cross-reference table, one 20 byte line per object
+        xref_offset = f.tell()
+        f.write(f'xref\n0 {count}\n0000000000 65535 f \n'.encode('ascii'))
+        for number in range(1, count):
+            f.write(f'{offsets[number]:010d} 00000 n \n'.encode('ascii'))
+        f.write(f'trailer\n<</Size {count}/Root {catalog} 0 R>>\n'
+                f'startxref\n{xref_offset}\n%%EOF\n'.encode('ascii'))
+
+def _copy_object(doc, xref, number, renumber, write_object):
+    body = doc.xref_object(xref, compressed=True, ascii=True)
+    if not doc.xref_is_stream(xref):
+        write_object(number, _rewrite(body, renumber))
+        return
+    data = doc.xref_stream_raw(xref) or b''
+    # The length may be an indirect object; make it direct and exact
+    body = _LENGTH.sub('', body, count=1)
+    body = body.replace('<<', f'<</Length {len(data)}', 1)
+    write_object(number, _rewrite(body, renumber), data)
+
+def _page_tree_nodes(doc, page_xrefs):
+    """Xrefs of the /Pages nodes above the given pages, and the catalog.
+
+    References to any of them are pointed at the output's own page tree.
+    """
+    nodes = {doc.pdf_catalog()}
+    for xref in page_xrefs:
+        parent = _parent(doc, xref)
+        while parent and parent not in nodes:
+            nodes.add(parent)
+            parent = _parent(doc, parent)
+    return nodes
+
+def _with_inherited(doc, xref, body, cache):
+    """Page dictionary with the attributes it inherits from its ancestors added"""
+    extra = ''
+    parent = None
+    for key in INHERITABLE:
+        if doc.xref_get_key(xref, key)[0] != 'null':
+            continue
+        # An explicit null is the same as a missing key
+        body = re.sub(rf'/{key}(?![A-Za-z0-9_])\s*null', '', body)
+        if parent is None:
+            parent = _parent(doc, xref)
+        value = _inherited(doc, parent, key, cache)
+        if value is not None:
+            extra += f'/{key} {value}'
+        elif key == 'Resources':
+            extra += '/Resources<<>>'
+        elif key == 'MediaBox':
+            extra += '/MediaBox[0 0 612 792]'
+    if not extra:
+        return body
+    return body[:body.rindex('>>')] + extra + '>>'
+
+def _inherited(doc, node, key, cache):
+    """Value of key on a page tree node or its nearest ancestor, None if unset.
+
+    Pages usually share their ancestors, so every node passed on the way
+    up is remembered in cache.
+    """
+    passed = []
+    value = None
+    while node:
+        if (node, key) in cache:
+            value = cache[node, key]
+            break
+        passed.append(node)
+        kind, found = doc.xref_get_key(node, key)
+        if kind != 'null':
+            value = found
+            break
+        node = _parent(doc, node)
+    for node in passed:
+        cache[node, key] = value
+    return value
+
+def _parent(doc, xref):
+    """Xref of a page tree node's parent, 0 for the root"""
+    kind, value = doc.xref_get_key(xref, 'Parent')
+    return int(value.split()[0]) if kind == 'xref' else 0
+
+def _without_dead_links(doc, xref, body, extracted):
+    """Page dictionary without link annotations to pages that aren't extracted.
+
+    Like insert_pdf, such links are dropped rather than left pointing
+    nowhere. extracted(page_xref) tells whether a page is extracted.
+    """
+    kind, value = doc.xref_get_key(xref, 'Annots')
+    if kind == 'xref':
+        kind, value = 'array', doc.xref_object(int(value.split()[0]), compressed=True)
+    if kind != 'array':
+        return body
+    annots = [int(match.group(1)) for match in _REF.finditer(value)]
+    kept = [annot for annot in annots if not _links_elsewhere(doc, annot, extracted)]
+    if len(kept) == len(annots):
+        return body
+    return _ANNOTS.sub('/Annots[' + ' '.join(f'{annot} 0 R' for annot in kept) + ']', body, count=1)
+
+def _links_elsewhere(doc, annot, extracted):
+    """Whether an annotation is a link to a page that isn't extracted"""
+    if doc.xref_get_key(annot, 'Subtype')[1] != '/Link':
+        return False
+    for key in ('Dest', 'A/D'):
+        kind, value = doc.xref_get_key(annot, key)
+        if kind == 'array':
+            match = _REF.search(value)
+            if match:
+                return not extracted(int(match.group(1)))
+    return False
+
+def _rewrite(body, renumber):
+    """Apply renumber to every indirect reference outside of strings"""
+    parts = []
+    start = 0
+    for string_start, string_end in _strings(body):
+        parts.append(_REF.sub(renumber, body[start:string_start]))
+        parts.append(body[string_start:string_end])
+        start = string_end
+    parts.append(_REF.sub(renumber, body[start:]))
+    return ''.join(parts)
+
+def _strings(body):
+    """(start, end) of each literal and hex string in a PDF object"""
+    length = len(body)
+    match = _STRING_START.search(body)
+    while match:
+        i = match.start()
+        if match.group() == '<<':
+            i += 1
+        elif match.group() == '<':
+            end = body.find('>', i)
+            end = length - 1 if end < 0 else end
+            yield i, end + 1
+            i = end
+        else:
+            start, depth = i, 0
+            while i < length:
+                char = body[i]
+                if char == '\\':
+                    i += 1
+                elif char == '(':
+                    depth += 1
+                elif char == ')':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                i += 1
+            yield start, i + 1
+        match = _STRING_START.search(body, i + 1)
@@ -0,0 +1,69 @@
+import bisect
+
+ROMAN_NUMERALS = [
+    (1000, 'm'), (900, 'cm'), (500, 'd'), (400, 'cd'), (100, 'c'), (90, 'xc'),
+    (50, 'l'), (40, 'xl'), (10, 'x'), (9, 'ix'), (5, 'v'), (4, 'iv'), (1, 'i'),
+]
+
+class PageLabels:
+    """Page labels resolved from the catalog's /PageLabels number tree.
+
+    The tree is read once into a short list of rules; individual labels
+    are computed only when asked for and cached, so no page objects are
+    loaded to label a document.
+    """
+
+    def __init__(self, rules, page_count):
+        self.rules = sorted(rules, key=lambda rule: rule['startpage'])
+        self.starts = [rule['startpage'] for rule in self.rules]
+        self._labels = [None] * page_count if self.rules else []
+
+    @classmethod
+    def from_document(cls, doc):
+        """Read the label rules of an open fitz.Document"""
+        try:
+            rules = doc.get_page_labels()
+        except Exception as e:
+            print(f"Error reading page labels: {str(e)}")
+            rules = []
+        return cls(rules, doc.page_count)
+
+    def label(self, page_index):
+        """Label of a 0-based page, or an empty string if it has none"""
+        if not self.rules:
+            return ''
+        label = self._labels[page_index]
+        if label is None:
+            label = self._compute(page_index)
+            self._labels[page_index] = label
+        return label
+
+    def _compute(self, page_index):
+        position = bisect.bisect_right(self.starts, page_index) - 1
+        if position < 0:
+            return ''
+        rule = self.rules[position]
+        number = rule.get('firstpagenum', 1) + page_index - rule['startpage']
+        return rule.get('prefix', '') + format_number(number, rule.get('style', ''))
+
+def format_number(number, style):
+    """Format a page number in one of the PDF page label styles"""
+    if style == 'D':
+        return str(number)
+    if style in ('r', 'R'):
+        text = to_roman(number)
+        return text.upper() if style == 'R' else text
+    if style in ('a', 'A'):
+        # a..z, then aa..zz, then aaa..zzz
+        letter = chr(ord('a') + (number - 1) % 26)
+        text = letter * ((number - 1) // 26 + 1)
+        return text.upper() if style == 'A' else text
+    return ''
+
+def to_roman(number):
+    text = ''
+    for value, numeral in ROMAN_NUMERALS:
+        while number >= value:
+            text += numeral
+            number -= value
+    return text
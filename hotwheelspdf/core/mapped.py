@@ -0,0 +1,64 @@
+import mmap
+import os
+import fitz  # PyMuPDF
+from ..utils.settings import Settings
+
+class MappedFile:
+    """Read-only memory map of a file.
+
+    The map is backed by the OS page cache, so every screen and worker
+    process mapping the same file shares a single copy of its bytes, and
+    nothing is read until it is touched. view is a zero-copy memoryview
+    that can be handed to fitz.open(stream=...).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self.file.close()
+            raise
+        self.view = memoryview(self.map)
+
+    def close(self):
+        """Unmap the file; anything opened on view must be closed first"""
+        if self.map is None:
+            return
+        self.view.release()
+        self.map.close()
+        self.file.close()
+        self.map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_threshold = None
+
+def mmap_threshold():
+    """Size in bytes from which inputs are memory-mapped, or 0 for never"""
+    global _threshold
+    if _threshold is None:
+        _threshold = max(0, Settings().get_mmap_threshold_mb()) * 1024 * 1024
+    return _threshold
+
+def open_document(path):
+    """Open a PDF with PyMuPDF, memory-mapping it if it is large.
+
+    Returns (doc, mapped), where mapped is the MappedFile backing doc or
+    None if doc was opened by path. Close doc before mapped.
+    """
+    threshold = mmap_threshold()
+    # Empty files can't be mapped; let fitz report them
+    if not threshold or os.path.getsize(path) < max(threshold, 1):
+        return fitz.open(path), None
+    mapped = MappedFile(path)
+    try:
+        return fitz.open(stream=mapped.view, filetype='pdf'), mapped
+    except BaseException:
+        mapped.close()
+        raise
@@ -0,0 +1,137 @@
+import os
+from pathlib import Path
+import fitz  # PyMuPDF
+import PyPDF2
+from .mapped import open_document
+from .paths import remove_partial_output
+from .progress import ProgressWriter, check_cancelled, report
+
+# Inserted input size after which the PyMuPDF engine flushes to disk
+FLUSH_BYTES = 256 * 1024 * 1024
+
+def merge_pypdf2(pdf_files, output_path, progress=None, cancelled=None):
+    """Merge PDFs into output_path with PyPDF2's PdfMerger.
+
+    progress is called as progress(done, total, message) in bytes: reading
+    the inputs counts for their total size, and writing the output for the
+    same amount again. Setting the cancelled event stops the merge; the
+    partial output file is removed on cancellation or failure.
+    """
+    sizes = [os.path.getsize(pdf_file) for pdf_file in pdf_files]
+    total = max(1, 2 * sum(sizes))
+    done = 0
+
+    merger = PyPDF2.PdfMerger()
+    try:
+        # Add each PDF to the merger
+        for number, (pdf_file, size) in enumerate(zip(pdf_files, sizes), 1):
+            check_cancelled(cancelled)
+            report(progress, done, total, f'Adding {Path(pdf_file).name} ({number}/{len(pdf_files)})')
+            merger.append(pdf_file)
+            done += size
+
+        # Write the merged PDF
+        check_cancelled(cancelled)
+        message = f'Writing {Path(output_path).name}'
+        report(progress, done, total, message)
+        with open(output_path, 'wb') as output_file:
+            merger.write(ProgressWriter(output_file, progress, cancelled, done, total, message))
+        report(progress, total, total, 'Done')
+    except BaseException:
+        remove_partial_output(output_path)
+        raise
+    finally:
+        merger.close()
+    return output_path
+
+def merge_pymupdf(pdf_files, output_path, progress=None, cancelled=None,
+                  flush_bytes=FLUSH_BYTES, garbage=0):
+    """Merge PDFs into output_path with fitz.Document.insert_pdf.
+
+    Each source is closed as soon as it has been inserted; large sources
+    are memory-mapped rather than read into memory. Whenever more
+    than flush_bytes of input has been inserted since the last flush, the
+    output is saved and reopened, and later batches are appended as
+    incremental updates. Peak memory therefore follows the largest input
+    (or flush_bytes) instead of the total. garbage is passed to the save
+    when everything fits into a single batch; incremental updates can't
+    be garbage collected. insert_pdf drops bookmarks, so the outlines of
+    the inputs are collected and set on the output at the end. Each input
+    is inserted in one call, which keeps links between its pages; the
+    sources and the output belong to this call alone, so no lock is taken.
+
+    progress and cancelled behave as in merge_pypdf2.
+    """
+    sizes = [os.path.getsize(pdf_file) for pdf_file in pdf_files]
+    total = max(1, 2 * sum(sizes))
+    done = 0
+    pending = 0  # Input bytes inserted since the last flush
+    saved = False
+    toc = []
+
+    output = fitz.open()
+    try:
+        for number, (pdf_file, size) in enumerate(zip(pdf_files, sizes), 1):
+            check_cancelled(cancelled)
+            report(progress, done, total, f'Adding {Path(pdf_file).name} ({number}/{len(pdf_files)})')
+            source, mapped = open_document(pdf_file)
+            try:
+                toc.extend(_shifted_toc(source, output.page_count))
+                output.insert_pdf(source)
+            finally:
+                source.close()
+                if mapped is not None:
+                    mapped.close()
+            done += size
+            pending += size
+
+            if pending >= flush_bytes and number < len(pdf_files):
+                report(progress, done, total, f'Writing {Path(output_path).name}')
+                _flush(output, output_path, saved, garbage)
+                output.close()
+                output = fitz.open(output_path)
+                saved = True
+                done += pending
+                pending = 0
+
+        check_cancelled(cancelled)
+        report(progress, done, total, f'Writing {Path(output_path).name}')
+        _set_toc(output, toc)
+        _flush(output, output_path, saved, garbage)
+        report(progress, total, total, 'Done')
+    except BaseException:
+        output.close()
+        remove_partial_output(output_path)
+        raise
+    output.close()
+    return output_path
+
+def _shifted_toc(source, offset):
+    """Outline entries of a source, pointing at its pages' place in the output"""
+    toc = source.get_toc(simple=False)
+    for item in toc:
+        if item[2] > 0:
+            item[2] += offset
+    return toc
+
+def _set_toc(output, toc):
+    if not toc:
+        return
+    try:
+        output.set_toc(toc)
+    except ValueError as e:
+        # An input with a malformed outline shouldn't fail the whole merge
+        print(f"Error copying bookmarks: {str(e)}")
+
+def _flush(output, output_path, saved, garbage):
+    """Write the first batch in full, later ones as incremental updates"""
+    if saved:
+        output.saveIncr()
+    else:
+        output.save(output_path, garbage=garbage)
+
+# Merge engines selectable in the UI, by settings key
+MERGE_ENGINES = {
+    'pymupdf': merge_pymupdf,
+    'pypdf2': merge_pypdf2,
+}
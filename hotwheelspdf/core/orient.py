@@ -0,0 +1,68 @@
+import math
+import fitz  # PyMuPDF
+from .document import PDFDocument
+from .progress import check_cancelled, report
+from .workers import map_chunks
+
+# Smaller documents are checked in this process, which is quicker than
+# starting workers to read a few pages each
+PARALLEL_MIN_PAGES = 32
+
+def text_rotation(page):
+    """Clockwise rotation that makes the text of a fitz.Page upright.
+
+    Every text line votes for its direction, weighted by its length, and
+    the winning direction is compared with the page's own /Rotate.
+    Returns None for pages without text, such as scans without OCR.
+    """
+    votes = {}
+    text = page.get_text('dict', flags=fitz.TEXTFLAGS_TEXT)
+    for block in text['blocks']:
+        for line in block.get('lines', ()):
+            chars = sum(len(span['text'].strip()) for span in line['spans'])
+            if not chars:
+                continue
+            # dir is in unrotated page space with y pointing down
+            dx, dy = line['dir']
+            angle = round(math.degrees(math.atan2(-dy, dx)) / 90) * 90 % 360
+            votes[angle] = votes.get(angle, 0) + chars
+    if not votes:
+        return None
+    angle = max(votes, key=votes.get)
+    return (angle - page.rotation) % 360
+
+def detect_orientations(input_path, page_indexes, workers=1, progress=None, cancelled=None):
+    """Detect the rotation that makes each page upright.
+
+    Returns a dict mapping 0-based page indexes to clockwise angles to add
+    to the page's /Rotate; pages whose orientation can't be told are left
+    out. Large documents are analysed in up to `workers` processes.
+    """
+    page_indexes = list(page_indexes)
+    results = {}
+    if (workers or 1) <= 1 or len(page_indexes) < PARALLEL_MIN_PAGES:
+        document = PDFDocument(input_path)
+        try:
+            for done, page_index in enumerate(page_indexes):
+                check_cancelled(cancelled)
+                with document.lock:
+                    rotation = text_rotation(document.doc[page_index])
+                if rotation is not None:
+                    results[page_index] = rotation
+                report(progress, done + 1, len(page_indexes),
+                       f'Checked {done + 1} of {len(page_indexes)} pages')
+        finally:
+            document.close()
+        return results
+
+    done = 0
+    for chunk_results, checked in map_chunks(_detect_chunk, input_path, page_indexes,
+                                             workers, cancelled):
+        results.update(chunk_results)
+        done += checked
+        report(progress, done, len(page_indexes), f'Checked {done} of {len(page_indexes)} pages')
+    return results
+
+def _detect_chunk(input_path, page_indexes):
+    """Runs in a worker process; checks its pages from one open document"""
+    return detect_orientations(input_path, page_indexes), len(page_indexes)
@@ -0,0 +1,96 @@
+import os
+from itertools import islice
+from pathlib import Path
+from .ranges import PageRanges
+
+def default_export_folder(input_paths, export_folder=None):
+    """Get the default export folder for a set of input files.
+    Priority:
+    1. User-selected export folder
+    2. First existing, writable parent folder of the input PDFs
+    3. Downloads folder as fallback
+    """
+    if export_folder:
+        return export_folder
+
+    for input_path in input_paths:
+        try:
+            parent = Path(input_path).parent
+            # Check if the parent folder exists and is writable
+            if parent.exists() and os.access(str(parent), os.W_OK):
+                return str(parent)
+        except Exception:
+            continue
+
+    # Fallback to Downloads folder
+    return str(Path.home() / 'Downloads')
+
+def unique_output_path(output_dir, base_name, suffix, reserve=False):
+    """Return output_dir/base_name+suffix, adding _1, _2... if it exists.
+
+    With reserve=True an empty file is created atomically at the returned
+    path, so parallel workers can never pick the same name.
+    """
+    output_dir = Path(output_dir)
+    counter = 0
+    while True:
+        if counter:
+            output_path = output_dir / f'{base_name}_{counter}{suffix}'
+        else:
+            output_path = output_dir / f'{base_name}{suffix}'
+        counter += 1
+
+        # Handle file name conflicts
+        if not reserve:
+            if not output_path.exists():
+                return str(output_path)
+            continue
+        try:
+            os.close(os.open(str(output_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return str(output_path)
+        except FileExistsError:
+            continue
+
+def split_output_path(input_path, pages, output_dir, reserve=False):
+    """Output path for the given pages split out of input_path"""
+    input_path = Path(input_path)
+    pages = PageRanges.from_pages(pages)
+
+    # Create a concise page range string for the filename; 16 numbers are
+    # always over the limit, so a huge selection is never spelled out
+    page_str = '_'.join(str(p) for p in islice(pages, 16))
+    if len(page_str) > 30:
+        # If too long, use first and last page
+        page_str = f'{pages.first}-{pages.last}'
+
+    return unique_output_path(output_dir, f'{input_path.stem}_pages_{page_str}',
+                              input_path.suffix, reserve)
+
+def rotated_output_path(input_path, output_dir):
+    """Output path for a rotated copy of input_path"""
+    input_path = Path(input_path)
+    return unique_output_path(output_dir, f'{input_path.stem}_rotated', input_path.suffix)
+
+def backup_output_path(input_path):
+    """Path for a backup copy of input_path taken before changing it in place"""
+    input_path = Path(input_path)
+    return unique_output_path(input_path.parent, input_path.name, '.bak')
+
+def merged_output_path(pdf_files, output_dir):
+    """Output path for the merge of pdf_files"""
+    base_name = 'merged'
+
+    # Try to create a meaningful name from input files
+    if len(pdf_files) <= 3:
+        stems = [Path(f).stem for f in pdf_files]
+        base_name = '_'.join(stems)
+
+    return unique_output_path(output_dir, base_name, '.pdf')
+
+def remove_partial_output(output_path):
+    """Delete an output file left behind by a failed or cancelled job"""
+    try:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+    except OSError as e:
+        print(f"Error removing partial output: {str(e)}")
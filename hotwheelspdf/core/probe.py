@@ -0,0 +1,68 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from PyPDF2 import PdfReader
+from .mapped import open_document
+
+def probe_pdf(path, progress=None, cancelled=None):
+    """Describe a PDF from its header, trailer and cross-reference table.
+
+    No pages are loaded: the page count comes from the page tree's /Count.
+    PyPDF2 does the reading so many files can be probed at once; files it
+    can't read are retried with PyMuPDF, which repairs damaged files just
+    like the merge will. Returns a dict with path, size, version, pages,
+    encrypted, and error, which says why the file can't be merged or is
+    None.
+    """
+    info = {'path': path, 'size': None, 'version': None, 'pages': None,
+            'encrypted': False, 'error': None}
+    try:
+        info['size'] = os.path.getsize(path)
+        # An open file keeps PyPDF2 from reading the whole PDF into memory
+        with open(path, 'rb') as f:
+            reader = PdfReader(f, strict=False)
+            info['encrypted'] = reader.is_encrypted
+            if reader.is_encrypted and not reader.decrypt(''):
+                info['error'] = 'Password protected'
+                return info
+            root = reader.trailer['/Root']
+            info['version'] = str(root.get('/Version', reader.pdf_header[5:])).lstrip('/')
+            info['pages'] = int(root['/Pages']['/Count'])
+    except Exception:
+        _probe_with_fitz(info)
+    if info['error'] is None and not info['pages']:
+        info['error'] = 'No pages'
+    return info
+
+def _probe_with_fitz(info):
+    try:
+        doc, mapped = open_document(info['path'])
+        try:
+            info['encrypted'] = bool(doc.is_encrypted or doc.needs_pass)
+            if doc.needs_pass:
+                info['error'] = 'Password protected'
+                return
+            info['version'] = doc.metadata.get('format', '').replace('PDF ', '') or None
+            info['pages'] = doc.page_count
+        finally:
+            doc.close()
+            if mapped is not None:
+                mapped.close()
+    except Exception as e:
+        info['error'] = f'Unreadable: {str(e)}'
+
+def probe_pdfs(paths, workers=8):
+    """Probe several PDFs concurrently; results are in the order of paths"""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(probe_pdf, paths))
+
+def probe_problems(infos):
+    """Messages for the probed files that can't be merged"""
+    return [f"{os.path.basename(info['path'])}: {info['error']}"
+            for info in infos if info['error']]
+
+def format_size(nbytes):
+    """Human readable file size"""
+    for unit in ('bytes', 'KB', 'MB', 'GB'):
+        if nbytes < 1024 or unit == 'GB':
+            return f'{nbytes:.0f} {unit}' if unit == 'bytes' else f'{nbytes:.1f} {unit}'
+        nbytes /= 1024
@@ -0,0 +1,38 @@
+class OperationCancelled(Exception):
+    """Raised inside a long running operation when the user cancels it"""
+
+def check_cancelled(cancelled):
+    """Raise OperationCancelled if the cancelled event has been set"""
+    if cancelled is not None and cancelled.is_set():
+        raise OperationCancelled()
+
+def report(progress, done, total, message=''):
+    """Call a progress(done, total, message) callback if one was given"""
+    if progress is not None:
+        progress(done, total, message)
+
+class ProgressWriter:
+    """File wrapper that reports bytes written and honours cancellation.
+
+    Library writers only see a normal binary file; every write() advances
+    the progress by the number of bytes written, starting at offset.
+    """
+
+    def __init__(self, file, progress=None, cancelled=None, offset=0, total=0, message=''):
+        self.file = file
+        self.progress = progress
+        self.cancelled = cancelled
+        self.offset = offset
+        self.total = total
+        self.message = message
+        self.written = 0
+
+    def write(self, data):
+        check_cancelled(self.cancelled)
+        count = self.file.write(data)
+        self.written += len(data)
+        report(self.progress, min(self.offset + self.written, self.total), self.total, self.message)
+        return count
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
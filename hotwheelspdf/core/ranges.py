@@ -0,0 +1,211 @@
+import bisect
+
+class PageRanges:
+    """Set of page numbers stored as sorted, merged (start, end) ranges.
+
+    Selecting every page of a huge document is a single range, so adding,
+    removing, testing and formatting cost O(number of ranges), not pages.
+    Iterating yields the individual page numbers in order.
+    """
+
+    def __init__(self, ranges=()):
+        self._ranges = []
+        for start, end in ranges:
+            self.add(start, end)
+
+    @classmethod
+    def from_pages(cls, pages):
+        """Build from any iterable of page numbers"""
+        if isinstance(pages, PageRanges):
+            return pages.copy()
+        result = cls()
+        for page in sorted(set(pages)):
+            if result._ranges and page == result._ranges[-1][1] + 1:
+                result._ranges[-1] = (result._ranges[-1][0], page)
+            else:
+                result._ranges.append((page, page))
+        return result
+
+    def copy(self):
+        result = PageRanges()
+        result._ranges = list(self._ranges)
+        return result
+
+    def runs(self):
+        """The (start, end) ranges, inclusive, in ascending order"""
+        return list(self._ranges)
+
+    @property
+    def first(self):
+        return self._ranges[0][0] if self._ranges else None
+
+    @property
+    def last(self):
+        return self._ranges[-1][1] if self._ranges else None
+
+    def add(self, start, end=None):
+        """Add the pages start..end inclusive"""
+        if end is None:
+            end = start
+        if start > end:
+            start, end = end, start
+        ranges = self._ranges
+        i = bisect.bisect_left(ranges, (start,))
+        # Merge with neighbours that overlap or touch the new range
+        if i > 0 and ranges[i - 1][1] >= start - 1:
+            i -= 1
+        j = i
+        while j < len(ranges) and ranges[j][0] <= end + 1:
+            j += 1
+        if i < j:
+            start = min(start, ranges[i][0])
+            end = max(end, ranges[j - 1][1])
+        ranges[i:j] = [(start, end)]
+
+    def discard(self, start, end=None):
+        """Remove the pages start..end inclusive"""
+        if end is None:
+            end = start
+        if start > end:
+            start, end = end, start
+        ranges = self._ranges
+        i = bisect.bisect_left(ranges, (start,))
+        if i > 0 and ranges[i - 1][1] >= start:
+            i -= 1
+        j = i
+        pieces = []
+        while j < len(ranges) and ranges[j][0] <= end:
+            first, last = ranges[j]
+            if first < start:
+                pieces.append((first, start - 1))
+            if last > end:
+                pieces.append((end + 1, last))
+            j += 1
+        ranges[i:j] = pieces
+
+    def union(self, other):
+        result = self.copy()
+        for start, end in other.runs():
+            result.add(start, end)
+        return result
+
+    def difference(self, other):
+        result = self.copy()
+        for start, end in other.runs():
+            result.discard(start, end)
+        return result
+
+    def intersection(self, other):
+        return self.difference(self.difference(other))
+
+    def shifted(self, offset):
+        """The same ranges moved by offset, e.g. -1 for 0-based page indexes"""
+        result = PageRanges()
+        result._ranges = [(start + offset, end + offset) for start, end in self._ranges]
+        return result
+
+    def __contains__(self, page):
+        i = bisect.bisect_right(self._ranges, (page, float('inf'))) - 1
+        return i >= 0 and self._ranges[i][1] >= page
+
+    def __iter__(self):
+        for start, end in self._ranges:
+            yield from range(start, end + 1)
+
+    def __len__(self):
+        return sum(end - start + 1 for start, end in self._ranges)
+
+    def __bool__(self):
+        return bool(self._ranges)
+
+    def __eq__(self, other):
+        if not isinstance(other, PageRanges):
+            return NotImplemented
+        return self._ranges == other._ranges
+
+    def __repr__(self):
+        return f"PageRanges({self._ranges!r})"
+
+def parse_page_range(range_str, total_pages):
+    """Parse a page range string into a PageRanges of page numbers.
+    Examples:
+        "1,3-5" -> pages 1, 3, 4, 5
+        "1-3,5" -> pages 1, 2, 3, 5
+        "1-3,~5" -> pages 1, 2, 3, 5
+    """
+    pages, separate = parse_split_spec(range_str, total_pages)
+    return pages.union(separate)
+
+def parse_page_selection(selection, total_pages):
+    """Parse 'all', 'odd', 'even' or a page range string into PageRanges.
+
+    An empty selection means every page.
+    """
+    key = selection.strip().lower()
+    if key in ('', 'all'):
+        return PageRanges([(1, total_pages)]) if total_pages else PageRanges()
+    if key in ('odd', 'even'):
+        return PageRanges.from_pages(range(1 if key == 'odd' else 2, total_pages + 1, 2))
+    return parse_page_range(selection, total_pages)
+
+def parse_split_spec(range_str, total_pages):
+    """Parse a page range string into combined and separate pages.
+
+    Parts prefixed with ~ are exported as one file per page, everything
+    else goes into a single combined file. Returns two PageRanges.
+    Examples:
+        "1-3,~5" -> pages 1-3, separate page 5
+        "~2-4" -> no pages, separate pages 2-4
+    """
+    pages = PageRanges()
+    separate = PageRanges()
+    if not range_str.strip():
+        return pages, separate
+
+    parts = range_str.split(',')
+    
+    for part in parts:
+        part = part.strip()
+        target = pages
+        if part.startswith('~'):
+            target = separate
+            part = part[1:].strip()
+        if '-' in part:
+            try:
+                start, end = map(int, part.split('-'))
+            except ValueError:
+                raise ValueError(f"Invalid range format: {part}")
+            target.add(start, end)
+        else:
+            try:
+                target.add(int(part))
+            except ValueError:
+                raise ValueError(f"Invalid page number: {part}")
+
+    # Validate page numbers
+    for ranges in (pages, separate):
+        if ranges and (ranges.first < 1 or ranges.last > total_pages):
+            raise ValueError(f"Page numbers must be between 1 and {total_pages}")
+
+    return pages, separate
+
+def pages_to_range_str(pages, separate=()):
+    """Convert page numbers to a range string.
+
+    pages and separate are PageRanges or plain lists of page numbers;
+    pages that are also in separate are written with the ~ prefix.
+    """
+    pages = PageRanges.from_pages(pages)
+    separate = pages.intersection(PageRanges.from_pages(separate))
+    ranges = _format_runs(pages.difference(separate), '')
+    ranges += _format_runs(separate, '~')
+    return ",".join(ranges)
+
+def _format_runs(pages, prefix):
+    ranges = []
+    for start, end in pages.runs():
+        if start == end:
+            ranges.append(f"{prefix}{start}")
+        else:
+            ranges.append(f"{prefix}{start}-{end}")
+    return ranges
@@ -0,0 +1,74 @@
+from .document import PDFDocument
+from .orient import detect_orientations
+from .paths import backup_output_path, default_export_folder, rotated_output_path
+from .progress import check_cancelled, report
+from .ranges import parse_page_selection
+
+# How rotated PDFs are written:
+#   full        - rewrite every object into a new file
+#   incremental - copy the file and append only the changed pages
+#   in_place    - append the changed pages to the file itself, after a backup
+SAVE_MODES = ('full', 'incremental', 'in_place')
+
+def rotate_file(input_path, angle, range_str='', export_folder=None, mode='full',
+                auto_orient=False, workers=1):
+    """Rotate pages of input_path clockwise by angle into a new PDF.
+
+    range_str selects the pages to rotate: 'all', 'odd', 'even' or a page
+    range; an empty string rotates every page. With auto_orient the angle
+    is ignored and each selected page is turned so its text is upright.
+    mode is one of SAVE_MODES. Returns a dict describing the result.
+    """
+    if angle % 90:
+        raise ValueError('Rotation angle must be a multiple of 90 degrees')
+    if mode not in SAVE_MODES:
+        raise ValueError(f'Unknown save mode: {mode}')
+    document = PDFDocument(input_path)
+    try:
+        pages = parse_page_selection(range_str, document.page_count)
+        if auto_orient:
+            detected = detect_orientations(input_path, pages.shifted(-1), workers)
+            rotations = {i: rotation for i, rotation in detected.items() if rotation}
+        else:
+            rotations = add_rotations({}, pages, angle)
+        result = save_rotations(document, rotations, mode, export_folder)
+    finally:
+        document.close()
+    result.update({'input': input_path, 'pages': len(rotations)})
+    return result
+
+def add_rotations(rotations, pages, angle):
+    """Add a clockwise angle to the pending rotations of 1-based pages.
+
+    rotations maps 0-based page indexes to angles on top of each page's
+    own /Rotate and is updated in place; pages that come back to 0 are
+    dropped. Returns rotations.
+    """
+    for page_num in pages:
+        rotation = (rotations.get(page_num - 1, 0) + angle) % 360
+        if rotation:
+            rotations[page_num - 1] = rotation
+        else:
+            rotations.pop(page_num - 1, None)
+    return rotations
+
+def save_rotations(document, rotations, mode='full', export_folder=None,
+                   progress=None, cancelled=None):
+    """Write pending rotations of a PDFDocument in the given save mode.
+
+    Returns a dict with the output path, plus the backup path when the
+    file was changed in place. The save itself can't be interrupted, so
+    cancelled is only checked before it starts.
+    """
+    check_cancelled(cancelled)
+    if mode == 'in_place':
+        backup_path = backup_output_path(document.path)
+        document.save_rotated_in_place(rotations, backup_path)
+        result = {'output': document.path, 'backup': backup_path}
+    else:
+        output_dir = default_export_folder([document.path], export_folder)
+        output_path = rotated_output_path(document.path, output_dir)
+        document.save_rotated(output_path, rotations, incremental=(mode == 'incremental'))
+        result = {'output': output_path}
+    report(progress, 1, 1, 'Saved')
+    return result
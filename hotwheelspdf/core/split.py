@@ -0,0 +1,123 @@
+import os
+from concurrent.futures import as_completed
+from .document import PDFDocument
+from .paths import default_export_folder, remove_partial_output, split_output_path
+from .progress import check_cancelled, report
+from .ranges import PageRanges, parse_split_spec
+from .workers import map_chunks, process_pool
+
+# Below this many output files, worker processes cost more than they save
+PARALLEL_MIN_OUTPUTS = 16
+
+def split_file(input_path, range_str, export_folder=None, workers=1,
+               progress=None, cancelled=None, document=None):
+    """Extract the pages in range_str from input_path into new PDFs.
+
+    Plain pages go into one combined file and every ~ page gets a file of
+    its own; outputs are named and placed exactly like the split screen
+    does, with each name claimed atomically. Separate files are written by
+    up to `workers` processes. document may be an open PDFDocument of
+    input_path, such as the registry's shared one; otherwise the file is
+    opened here. Returns a dict describing the result.
+    """
+    owned = document is None
+    if owned:
+        document = PDFDocument(input_path)
+    try:
+        pages, separate = parse_split_spec(range_str, document.page_count)
+        groups = ([pages] if pages else []) + [PageRanges([(page, page)]) for page in separate]
+        if not groups:
+            raise ValueError('Please select at least one page to split.')
+
+        output_dir = default_export_folder([input_path], export_folder)
+        jobs = []
+        try:
+            for group in groups:
+                output_path = split_output_path(input_path, group, output_dir, reserve=True)
+                jobs.append((group.shifted(-1), output_path))
+            write_outputs(input_path, jobs, workers, progress, cancelled, document)
+        except BaseException:
+            for _, output_path in jobs:
+                remove_partial_output(output_path)
+            raise
+    finally:
+        if owned:
+            document.close()
+    return {'input': input_path, 'outputs': [output_path for _, output_path in jobs],
+            'pages': len(pages.union(separate))}
+
+def write_outputs(input_path, jobs, workers=1, progress=None, cancelled=None, document=None):
+    """Write each (page_indexes, output_path) job from input_path.
+
+    In this process the pages come from document if one is given. With
+    more than one worker the jobs are handed out in chunks, and each
+    worker process opens the source by path once for its whole chunk.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < PARALLEL_MIN_OUTPUTS:
+        owned = document is None
+        if owned:
+            document = PDFDocument(input_path)
+        try:
+            # A single file reports its pages, several files report files
+            page_progress = progress if len(jobs) == 1 else None
+            for done, (page_indexes, output_path) in enumerate(jobs):
+                check_cancelled(cancelled)
+                document.extract_pages(page_indexes, output_path, page_progress, cancelled)
+                report(progress, done + 1, len(jobs), f'Wrote {done + 1} of {len(jobs)} files')
+        finally:
+            if owned:
+                document.close()
+        return
+
+    done = 0
+    for written in map_chunks(_write_chunk, input_path, jobs, workers, cancelled):
+        done += written
+        report(progress, done, len(jobs), f'Wrote {done} of {len(jobs)} files')
+
+def _write_chunk(input_path, jobs):
+    """Runs in a worker process; writes its jobs from one open document"""
+    write_outputs(input_path, jobs)
+    return len(jobs)
+
+def _split_worker(input_path, range_str, export_folder):
+    """Runs in a worker process; errors are returned rather than raised"""
+    try:
+        return split_file(input_path, range_str, export_folder)
+    except Exception as e:
+        return {'input': input_path, 'error': str(e)}
+
+def iter_batch_split(pdf_files, range_str, export_folder=None, workers=None, cancelled=None):
+    """Split several PDFs in parallel worker processes.
+
+    The same range is applied to every file. Results are yielded as each
+    file finishes, in completion order; failed files yield a dict with an
+    'error' key instead of stopping the batch. Setting cancelled stops
+    handing out files that haven't started yet.
+    """
+    with process_pool(workers) as executor:
+        futures = [executor.submit(_split_worker, pdf_file, range_str, export_folder)
+                   for pdf_file in pdf_files]
+        try:
+            for future in as_completed(futures):
+                check_cancelled(cancelled)
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+def batch_split(pdf_files, range_str, export_folder=None, workers=None,
+                progress=None, cancelled=None):
+    """Run iter_batch_split, reporting each finished file through progress.
+
+    Returns the list of per-file results.
+    """
+    results = []
+    for result in iter_batch_split(pdf_files, range_str, export_folder, workers, cancelled):
+        results.append(result)
+        if 'error' in result:
+            message = f"Failed {result['input']}: {result['error']}"
+        else:
+            message = f"Split {result['input']} ({len(results)}/{len(pdf_files)})"
+        report(progress, len(results), len(pdf_files), message)
+    return results
@@ -0,0 +1,35 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .progress import check_cancelled
+
+# Several chunks per worker keep them all busy until the end
+CHUNKS_PER_WORKER = 4
+
+def process_pool(workers=None):
+    """ProcessPoolExecutor whose workers start as fresh interpreters.
+
+    Forked workers would inherit document locks as they were at the moment
+    of the fork: if a render thread held one, every worker blocks on it
+    forever. Spawned workers import the core modules themselves instead.
+    """
+    return ProcessPoolExecutor(max_workers=workers,
+                               mp_context=multiprocessing.get_context('spawn'))
+
+def map_chunks(function, input_path, items, workers, cancelled=None):
+    """Call function(input_path, chunk) on chunks of items in worker processes.
+
+    function must be importable by the workers, so a module level function
+    that opens input_path once for its chunk. Results are yielded in
+    completion order; setting cancelled drops the chunks not started yet.
+    """
+    with process_pool(workers) as executor:
+        chunk_size = -(-len(items) // (workers * CHUNKS_PER_WORKER))
+        futures = [executor.submit(function, input_path, items[i:i + chunk_size])
+                   for i in range(0, len(items), chunk_size)]
+        try:
+            for future in as_completed(futures):
+                check_cancelled(cancelled)
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
@@ -1,13 +1,13 @@
 import sys
 import os
+import time
+from collections import OrderedDict
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
-                           QPushButton, QStatusBar, QLabel)
+                           QPushButton, QStatusBar, QLabel, QStackedWidget, QMessageBox)
 from PyQt5.QtCore import Qt, QSettings, QTimer, QEvent
 from PyQt5.QtGui import QPixmap, QPalette, QBrush
-from .screens.split_screen import SplitScreen
-from .screens.merge_screen import MergeScreen
-from .screens.rotate_screen import RotateScreen
 from .utils.settings import Settings
+from .utils.startup import FirstPaintWatcher, StartupTimer, preload_engine
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -19,21 +19,72 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
+# Screens are imported when first opened, so PyMuPDF and PyPDF2 don't delay
+# the first window. The imports are written out, not built from strings, so
+# PyInstaller still finds and bundles the screen modules.
+def split_screen_class():
+    from .screens.split_screen import SplitScreen
+    return SplitScreen
+
+def merge_screen_class():
+    from .screens.merge_screen import MergeScreen
+    return MergeScreen
+
+def rotate_screen_class():
+    from .screens.rotate_screen import RotateScreen
+    return RotateScreen
+
+SCREENS = {
+    'split': split_screen_class,
+    'merge': merge_screen_class,
+    'rotate': rotate_screen_class,
+}
+
+# Window sizes are rounded up to this many pixels when scaling the
+# background, so small resizes reuse a cached pixmap
+BACKGROUND_BUCKET = 64
+# Smoothly scaled backgrounds kept, one per size bucket
+BACKGROUND_CACHE_SIZE = 8
+
 class HotwheelsPDF(QMainWindow):
+    """Main window: the menu and the screens, all kept in one stacked widget.
+
+    Screens are created the first time they are opened and then stay
+    resident, with their documents, previews and selections, so switching
+    back is instant. Screens left unused for screen_idle_minutes are freed
+    by a periodic check, unless they are still working.
+    """
+
     def __init__(self):
         super().__init__()
         self.settings = Settings()
-        self.window_settings = QSettings('Codeium', 'HotwheelsPDF')
+        self.screens = {}  # name -> resident screen widget
+        self.last_used = {}  # name -> time.monotonic() when the screen was left
+        self.background_cache = OrderedDict()  # size bucket -> smoothly scaled QPixmap
+
+        # Resizes scale the background quickly; the smooth pass runs once they stop
+        self.background_timer = QTimer(self)
+        self.background_timer.setSingleShot(True)
+        self.background_timer.setInterval(150)
+        self.background_timer.timeout.connect(self.update_background)
+
         self.init_ui()
         self.restore_window_state()
 
+        self.evict_timer = QTimer(self)
+        self.evict_timer.setInterval(60 * 1000)
+        self.evict_timer.timeout.connect(self.evict_idle_screens)
+        self.evict_timer.start()
+
     def init_ui(self):
         self.setWindowTitle('HotwheelsPDF')
-        
-        # Create central widget and layout
-        self.central_widget = QWidget()
-        self.setCentralWidget(self.central_widget)
-        layout = QVBoxLayout(self.central_widget)
+
+        # The menu is the first page of the stack; screens are added as opened
+        self.stack = QStackedWidget()
+        self.setCentralWidget(self.stack)
+        self.menu = QWidget()
+        self.stack.addWidget(self.menu)
+        layout = QVBoxLayout(self.menu)
 
         # Setup background first (so it's behind everything)
         self.setup_background()
@@ -108,6 +159,7 @@ class HotwheelsPDF(QMainWindow):
 
             self.background_label = QLabel(self)
             self.background_pixmap = QPixmap(flames_path)
+            self.background_cache.clear()
             
             if self.background_pixmap.isNull():
                 print(f"Warning: Failed to load background image from {flames_path}")
@@ -121,8 +173,12 @@ class HotwheelsPDF(QMainWindow):
         except Exception as e:
             print(f"Error setting up background: {str(e)}")
 
-    def update_background(self):
-        """Update the background size and position"""
+    def update_background(self, smooth=True):
+        """Update the background size and position.
+
+        With smooth=False a cached smooth pixmap is used if there is one,
+        and otherwise the image is scaled quickly; used while resizing.
+        """
         try:
             if not hasattr(self, 'background_label') or not self.background_label:
                 return
@@ -135,58 +191,77 @@ class HotwheelsPDF(QMainWindow):
             if not hasattr(self, 'background_pixmap') or self.background_pixmap.isNull():
                 return
 
-            # Get dimensions, ensuring they're not zero
-            pixmap_width = max(1, self.background_pixmap.width())
-            pixmap_height = max(1, self.background_pixmap.height())
             window_width = max(1, self.width())
             window_height = max(1, self.height())
+            scaled_pixmap = self.scaled_background(window_width, window_height, smooth)
 
-            # Calculate target height (half of window height)
-            target_height = window_height // 2
-            
-            # Calculate the width needed to maintain aspect ratio
-            aspect_ratio = pixmap_width / pixmap_height
-            target_width = int(target_height * aspect_ratio)
-            
-            # If target width is less than window width, scale based on width instead
-            if target_width < window_width:
-                target_width = window_width
-                target_height = int(target_width / aspect_ratio)
-            
-            # Scale the pixmap
-            scaled_pixmap = self.background_pixmap.scaled(
-                target_width,
-                target_height,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            
             # Calculate x position to center horizontally if wider than window
             x_position = (window_width - scaled_pixmap.width()) // 2
-            
+
             # Set the pixmap and position
-            self.background_label.setPixmap(scaled_pixmap)
+            if self.background_label.pixmap() is None or \
+                    self.background_label.pixmap().cacheKey() != scaled_pixmap.cacheKey():
+                self.background_label.setPixmap(scaled_pixmap)
             self.background_label.setGeometry(
                 x_position,
                 window_height - scaled_pixmap.height(),
                 scaled_pixmap.width(),
                 scaled_pixmap.height()
             )
-            
+
             # Ensure it stays behind other widgets
             self.background_label.lower()
             self.background_label.show()
         except Exception as e:
             print(f"Error updating background: {str(e)}")
 
+    def scaled_background(self, window_width, window_height, smooth=True):
+        """Background pixmap scaled for a window size, cached per size bucket"""
+        bucket = (-(-window_width // BACKGROUND_BUCKET) * BACKGROUND_BUCKET,
+                  -(-window_height // BACKGROUND_BUCKET) * BACKGROUND_BUCKET)
+        cached = self.background_cache.get(bucket)
+        if cached is not None:
+            self.background_cache.move_to_end(bucket)
+            return cached
+
+        # Get dimensions, ensuring they're not zero
+        pixmap_width = max(1, self.background_pixmap.width())
+        pixmap_height = max(1, self.background_pixmap.height())
+        window_width, window_height = bucket
+
+        # Calculate target height (half of window height)
+        target_height = window_height // 2
+
+        # Calculate the width needed to maintain aspect ratio
+        aspect_ratio = pixmap_width / pixmap_height
+        target_width = int(target_height * aspect_ratio)
+
+        # If target width is less than window width, scale based on width instead
+        if target_width < window_width:
+            target_width = window_width
+            target_height = int(target_width / aspect_ratio)
+
+        mode = Qt.SmoothTransformation if smooth else Qt.FastTransformation
+        scaled_pixmap = self.background_pixmap.scaled(
+            target_width, target_height, Qt.KeepAspectRatio, mode)
+        if smooth:
+            self.background_cache[bucket] = scaled_pixmap
+            if len(self.background_cache) > BACKGROUND_CACHE_SIZE:
+                self.background_cache.popitem(last=False)
+        return scaled_pixmap
+
     def resizeEvent(self, event):
         """Handle window resize events"""
         super().resizeEvent(event)
-        self.update_background()
+        self.update_background(smooth=False)
+        self.background_timer.start()
 
     def restore_window_state(self):
         """Restore window geometry and state from settings"""
-        geometry = self.window_settings.value('geometry')
+        geometry = self.settings.get_window_geometry()
+        if geometry is None:
+            # Older versions kept the geometry in QSettings
+            geometry = QSettings('Codeium', 'HotwheelsPDF').value('geometry')
         if geometry is not None:
             self.restoreGeometry(geometry)
         else:
@@ -195,7 +270,7 @@ class HotwheelsPDF(QMainWindow):
 
     def save_window_state(self):
         """Save window geometry and state to settings"""
-        self.window_settings.setValue('geometry', self.saveGeometry())
+        self.settings.set_window_geometry(self.saveGeometry())
 
     def showEvent(self, event):
         """Handle window show events"""
@@ -207,52 +282,105 @@ class HotwheelsPDF(QMainWindow):
         """Handle window state changes (maximize, minimize, etc.)"""
         super().changeEvent(event)
         if event.type() == QEvent.WindowStateChange and hasattr(self, 'background_label'):
-            # Use QTimer to delay the update slightly to ensure proper window dimensions
-            QTimer.singleShot(100, self.update_background)
+            # Wait for the final window dimensions
+            self.background_timer.start()
+
+    def show_screen(self, name):
+        """Switch to a screen by name, creating it the first time"""
+        screen = self.screens.get(name)
+        if screen is None:
+            try:
+                screen = SCREENS[name]()(self)
+            except Exception as e:
+                print(f"Error opening {name} screen: {str(e)}")
+                QMessageBox.critical(self, 'Error', f'Could not open the {name} screen: {str(e)}')
+                return None
+            self.screens[name] = screen
+            self.stack.addWidget(screen)
+        self.leave_current_screen()
+        self.stack.setCurrentWidget(screen)
+        return screen
 
     def show_split_screen(self):
-        self.save_window_state()
-        if hasattr(self, 'background_label'):
-            self.background_label.setParent(self)  # Ensure background stays with main window
-        self.split_screen = SplitScreen(self)
-        self.setCentralWidget(self.split_screen)
-        self.restore_window_state()
-        QTimer.singleShot(50, self.update_background)  # Update background after a short delay
+        return self.show_screen('split')
 
     def show_merge_screen(self):
-        self.save_window_state()
-        if hasattr(self, 'background_label'):
-            self.background_label.setParent(self)  # Ensure background stays with main window
-        self.merge_screen = MergeScreen(self)
-        self.setCentralWidget(self.merge_screen)
-        self.restore_window_state()
-        QTimer.singleShot(50, self.update_background)
+        return self.show_screen('merge')
 
     def show_rotate_screen(self):
-        self.save_window_state()
-        if hasattr(self, 'background_label'):
-            self.background_label.setParent(self)  # Ensure background stays with main window
-        self.rotate_screen = RotateScreen(self)
-        self.setCentralWidget(self.rotate_screen)
-        self.restore_window_state()
-        QTimer.singleShot(50, self.update_background)
+        return self.show_screen('rotate')
 
     def show_main_screen(self):
-        """Return to main screen while preserving window state"""
-        self.save_window_state()
-        if hasattr(self, 'background_label'):
-            self.background_label.setParent(self)  # Ensure background stays with main window
-        self.init_ui()
-        self.restore_window_state()
-        QTimer.singleShot(50, self.update_background)
+        """Return to the menu; the screen stays resident"""
+        self.leave_current_screen()
+        self.stack.setCurrentWidget(self.menu)
+
+    def leave_current_screen(self):
+        for name, screen in self.screens.items():
+            if screen is self.stack.currentWidget():
+                self.last_used[name] = time.monotonic()
+
+    def evict_idle_screens(self):
+        """Free screens that have not been shown for screen_idle_minutes"""
+        minutes = self.settings.get_screen_idle_minutes()
+        if minutes <= 0:
+            return
+        now = time.monotonic()
+        for name, screen in list(self.screens.items()):
+            if screen is self.stack.currentWidget() or screen.is_busy():
+                continue
+            if now - self.last_used.get(name, now) >= minutes * 60:
+                self.close_screen(name)
+
+    def close_screen(self, name):
+        """Release a screen's documents and background work, then destroy it"""
+        screen = self.screens.pop(name)
+        self.last_used.pop(name, None)
+        if screen is self.stack.currentWidget():
+            self.stack.setCurrentWidget(self.menu)
+        screen.release()
+        self.stack.removeWidget(screen)
+        screen.deleteLater()
 
     def closeEvent(self, event):
-        """Save window state when closing the application"""
+        """Save window state and free the screens when closing the application"""
         self.save_window_state()
+        for name in list(self.screens):
+            self.close_screen(name)
+        self.settings.flush()
         super().closeEvent(event)
 
-def main():
+def main(started=None, timing_output=None):
+    """Start the GUI.
+
+    started is a time.perf_counter() taken before this module was imported.
+    With timing_output (a file path or '-' for stdout, also read from the
+    HOTWHEELSPDF_STARTUP_TIMING environment variable) the import, window
+    construction and first paint times are written there as JSON, and the
+    application quits after its first paint.
+    """
+    timing_output = timing_output or os.environ.get('HOTWHEELSPDF_STARTUP_TIMING')
+    timer = None
+    if timing_output:
+        timer = StartupTimer(started or time.perf_counter(), timing_output)
+        timer.mark('imported')
+
     app = QApplication(sys.argv)
+    if timer:
+        timer.mark('app_created')
     window = HotwheelsPDF()
+    if timer:
+        timer.mark('window_built')
+        timer.watch(window)
+    # Warm up the PDF libraries once the window is on screen
+    FirstPaintWatcher(window, preload_engine)
     window.show()
+
+    try:
+        import pyi_splash  # Only present in executables built with --splash
+    except ImportError:
+        pass
+    else:
+        pyi_splash.close()
+
     sys.exit(app.exec_())
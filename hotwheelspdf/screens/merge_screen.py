@@ -1,10 +1,21 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-                           QLabel, QFileDialog, QMessageBox, QListWidget)
-from PyQt5.QtCore import Qt, pyqtSignal
+                           QLabel, QFileDialog, QMessageBox, QListWidget, QProgressBar,
+                           QComboBox, QCheckBox)
+from PyQt5.QtCore import Qt, QThreadPool, pyqtSignal
 from PyQt5.QtGui import QDragEnterEvent, QDropEvent
-import PyPDF2
 from pathlib import Path
-import os
+from ..core.paths import default_export_folder, merged_output_path
+from ..core.merge import MERGE_ENGINES
+from ..core.probe import format_size, probe_pdf, probe_problems
+from ..utils.jobs import Job
+
+# Garbage collection level used when "Remove unused objects" is checked:
+# drop unused objects and merge duplicate ones
+COMPACT_GARBAGE = 3
+
+# Files probed at once; probes queue on the screen's own pool so a large
+# drop never takes the global pool's threads from merges and splits
+PROBE_THREADS = 4
 
 class DropListWidget(QListWidget):
     """List widget that accepts drag and drop of PDF files"""
@@ -44,6 +55,11 @@ class MergeScreen(QWidget):
         self.parent = parent
         self.pdf_files = []
         self.export_folder = None  # Store custom export location
+        self.merge_job = None  # Background merge in progress
+        self.probes = {}  # path -> probe result, filled in as probes finish
+        self.probe_jobs = []  # Keeps running probes alive until they report
+        self.probe_pool = QThreadPool(self)
+        self.probe_pool.setMaxThreadCount(PROBE_THREADS)
         self.init_ui()
 
     def init_ui(self):
@@ -59,6 +75,10 @@ class MergeScreen(QWidget):
         self.pdf_list.dropped.connect(self.add_pdfs)
         layout.addWidget(self.pdf_list)
 
+        # Totals for the files probed so far
+        self.summary_label = QLabel('')
+        layout.addWidget(self.summary_label)
+
         # Buttons for file management
         btn_layout = QHBoxLayout()
         add_btn = QPushButton('Add PDFs')
@@ -88,17 +108,44 @@ class MergeScreen(QWidget):
         export_layout.addWidget(reset_export_btn)
         layout.addLayout(export_layout)
 
+        # Merge engine selection
+        engine_layout = QHBoxLayout()
+        engine_layout.addWidget(QLabel('Merge engine:'))
+        self.engine_combo = QComboBox()
+        self.engine_combo.addItem('PyMuPDF (low memory)', 'pymupdf')
+        self.engine_combo.addItem('PyPDF2', 'pypdf2')
+        engine_index = self.engine_combo.findData(self.parent.settings.get_merge_engine())
+        self.engine_combo.setCurrentIndex(max(0, engine_index))
+        self.engine_combo.currentIndexChanged.connect(self.on_engine_changed)
+        engine_layout.addWidget(self.engine_combo, stretch=1)
+        # Garbage collection only applies to the PyMuPDF engine
+        self.compact_checkbox = QCheckBox('Remove unused objects (slower)')
+        self.compact_checkbox.setChecked(self.parent.settings.get_merge_garbage() > 0)
+        self.compact_checkbox.toggled.connect(self.on_compact_toggled)
+        engine_layout.addWidget(self.compact_checkbox)
+        layout.addLayout(engine_layout)
+        self.update_compact_checkbox()
+
         # Merge and back buttons
         action_layout = QHBoxLayout()
-        merge_btn = QPushButton('Merge PDFs')
-        merge_btn.clicked.connect(self.merge_pdfs)
+        self.merge_btn = QPushButton('Merge PDFs')
+        self.merge_btn.clicked.connect(self.merge_pdfs)
+        self.cancel_btn = QPushButton('Cancel')
+        self.cancel_btn.clicked.connect(self.cancel_merge)
+        self.cancel_btn.setEnabled(False)
         back_btn = QPushButton('Back')
         back_btn.clicked.connect(self.go_back)
         
         action_layout.addWidget(back_btn)
-        action_layout.addWidget(merge_btn)
+        action_layout.addWidget(self.merge_btn)
+        action_layout.addWidget(self.cancel_btn)
         layout.addLayout(action_layout)
 
+        # Progress bar shown in the main window's status bar while merging
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setMaximumWidth(200)
+
         self.setLayout(layout)
 
     def select_export_folder(self):
@@ -125,28 +172,73 @@ class MergeScreen(QWidget):
         2. First valid parent folder from input PDFs
         3. Downloads folder as fallback
         """
-        if self.export_folder:
-            return self.export_folder
-            
-        # Try to find first valid parent folder from input PDFs
-        for pdf_path in self.pdf_files:
-            try:
-                parent = Path(pdf_path).parent
-                # Check if the parent folder exists and is writable
-                if parent.exists() and os.access(str(parent), os.W_OK):
-                    return str(parent)
-            except Exception:
-                continue
-                
-        # Fallback to Downloads folder
-        return str(Path.home() / 'Downloads')
+        return default_export_folder(self.pdf_files, self.export_folder)
+
+    def on_engine_changed(self, index):
+        """Remember the chosen merge engine between sessions"""
+        self.parent.settings.set_merge_engine(self.engine_combo.itemData(index))
+        self.update_compact_checkbox()
+
+    def update_compact_checkbox(self):
+        self.compact_checkbox.setEnabled(self.engine_combo.currentData() == 'pymupdf')
+
+    def on_compact_toggled(self, checked):
+        """Remember whether PyMuPDF merges garbage collect their output"""
+        self.parent.settings.set_merge_garbage(COMPACT_GARBAGE if checked else 0)
 
     def add_pdfs(self, pdf_paths):
-        """Add PDFs to the list (from drag and drop or file dialog)"""
+        """Add PDFs to the list (from drag and drop or file dialog).
+
+        Every file is listed at once and probed in the background; its
+        entry fills in with page count, size and version when that's done.
+        """
         for path in pdf_paths:
             if path not in self.pdf_files:
                 self.pdf_files.append(path)
-                self.pdf_list.addItem(Path(path).name)
+                self.probes.pop(path, None)
+                self.pdf_list.addItem(f'{Path(path).name} (checking...)')
+                job = Job(probe_pdf, path)
+                job.signals.finished.connect(self.on_probe_finished)
+                self.probe_jobs.append(job)
+                job.start(self.probe_pool)
+        self.update_summary()
+
+    def on_probe_finished(self, info):
+        self.probe_jobs = [job for job in self.probe_jobs if job.args[0] != info['path']]
+        self.probes[info['path']] = info
+        if info['path'] in self.pdf_files:
+            row = self.pdf_files.index(info['path'])
+            self.pdf_list.item(row).setText(self.describe_pdf(info))
+        self.update_summary()
+
+    def describe_pdf(self, info):
+        """List entry for a probed PDF"""
+        name = Path(info['path']).name
+        if info['error']:
+            return f"{name} ({info['error']})"
+        details = [f"{info['pages']} pages", format_size(info['size'])]
+        if info['version']:
+            details.append(f"PDF {info['version']}")
+        if info['encrypted']:
+            details.append('encrypted')
+        return f"{name} ({', '.join(details)})"
+
+    def update_summary(self):
+        """Show the estimated page count and size of the merged PDF"""
+        infos = [self.probes[path] for path in self.pdf_files if path in self.probes]
+        if not self.pdf_files:
+            self.summary_label.setText('')
+            return
+        usable = [info for info in infos if not info['error']]
+        text = (f"Output: about {sum(info['pages'] for info in usable)} pages, "
+                f"{format_size(sum(info['size'] for info in usable))}")
+        waiting = len(self.pdf_files) - len(infos)
+        if waiting:
+            text += f' (checking {waiting} more)'
+        problems = len(infos) - len(usable)
+        if problems:
+            text += f' - {problems} file(s) cannot be merged'
+        self.summary_label.setText(text)
 
     def select_files(self):
         """Open file dialog to select PDFs"""
@@ -163,60 +255,101 @@ class MergeScreen(QWidget):
             idx = self.pdf_list.row(item)
             self.pdf_list.takeItem(idx)
             self.pdf_files.pop(idx)
+        self.update_summary()
 
     def clear_files(self):
         """Clear all PDFs from the list"""
         self.pdf_list.clear()
         self.pdf_files.clear()
+        self.update_summary()
 
     def get_output_path(self):
         """Generate output path for merged PDF"""
         if not self.pdf_files:
             return None
-            
-        output_dir = Path(self.get_default_export_folder())
-        base_name = 'merged'
-        
-        # Try to create a meaningful name from input files
-        if len(self.pdf_files) <= 3:
-            stems = [Path(f).stem for f in self.pdf_files]
-            base_name = '_'.join(stems)
-        
-        output_path = output_dir / f'{base_name}.pdf'
-        
-        # Handle file name conflicts
-        counter = 1
-        while output_path.exists():
-            output_path = output_dir / f'{base_name}_{counter}.pdf'
-            counter += 1
-            
-        return str(output_path)
+        return merged_output_path(self.pdf_files, self.get_default_export_folder())
 
     def merge_pdfs(self):
         if len(self.pdf_files) < 2:
             QMessageBox.warning(self, 'Error', 'Please select at least 2 PDF files to merge.')
             return
 
+        if self.merge_job:
+            return
+
+        # Files the probe already rejected would only fail the merge later
+        problems = probe_problems(self.probes[path] for path in self.pdf_files
+                                  if path in self.probes)
+        if problems:
+            QMessageBox.warning(self, 'Error', 'These files cannot be merged:\n' + '\n'.join(problems))
+            return
+
         output_path = self.get_output_path()
         if not output_path:
             return
 
-        try:
-            merger = PyPDF2.PdfMerger()
-            
-            # Add each PDF to the merger
-            for pdf_file in self.pdf_files:
-                merger.append(pdf_file)
-            
-            # Write the merged PDF
-            merger.write(output_path)
-            merger.close()
-            
-            QMessageBox.information(self, 'Success', 'PDFs merged successfully!')
-            
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'An error occurred while merging PDFs: {str(e)}')
+        # Run the merge in the background so the window stays responsive
+        engine = self.engine_combo.currentData()
+        options = {'garbage': self.parent.settings.get_merge_garbage()} if engine == 'pymupdf' else {}
+        self.merge_job = Job(MERGE_ENGINES[engine], list(self.pdf_files), output_path, **options)
+        self.merge_job.signals.progress.connect(self.on_merge_progress)
+        self.merge_job.signals.finished.connect(self.on_merge_finished)
+        self.merge_job.signals.failed.connect(self.on_merge_failed)
+        self.merge_job.signals.cancelled.connect(self.on_merge_cancelled)
+        self.set_merging(True)
+        self.merge_job.start()
+
+    def cancel_merge(self):
+        """Stop the running merge; the partial output is removed"""
+        if self.merge_job:
+            self.cancel_btn.setEnabled(False)
+            self.parent.statusBar.showMessage('Cancelling merge...')
+            self.merge_job.cancel()
+
+    def set_merging(self, merging):
+        """Switch the UI between idle and merging states"""
+        self.merge_btn.setEnabled(not merging)
+        self.cancel_btn.setEnabled(merging)
+        status_bar = self.parent.statusBar
+        if merging:
+            self.progress_bar.setValue(0)
+            status_bar.addPermanentWidget(self.progress_bar)
+            self.progress_bar.show()
+            status_bar.showMessage('Merging PDFs...')
+        else:
+            status_bar.removeWidget(self.progress_bar)
+            self.merge_job = None
+
+    def on_merge_progress(self, done, total, message):
+        self.progress_bar.setValue(int(done * 1000 // total) if total else 0)
+        self.parent.statusBar.showMessage(message)
+
+    def on_merge_finished(self, output_path):
+        self.set_merging(False)
+        self.parent.statusBar.showMessage(f'Merged into {Path(output_path).name}')
+        QMessageBox.information(self, 'Success', 'PDFs merged successfully!')
+
+    def on_merge_failed(self, error):
+        self.set_merging(False)
+        self.parent.statusBar.showMessage('Merge failed')
+        QMessageBox.critical(self, 'Error', f'An error occurred while merging PDFs: {error}')
+
+    def on_merge_cancelled(self):
+        self.set_merging(False)
+        self.parent.statusBar.showMessage('Merge cancelled')
 
     def go_back(self):
-        """Return to main screen while preserving window state"""
+        """Return to the main screen; the file list and any running merge stay"""
         self.parent.show_main_screen()
+
+    def is_busy(self):
+        return self.merge_job is not None or bool(self.probe_jobs)
+
+    def release(self):
+        """Cancel background work before the screen is freed"""
+        # Probes not started yet are dropped; the pool waits for the rest
+        self.probe_pool.clear()
+        if self.merge_job:
+            # The screen is about to be destroyed, so don't leave a merge behind
+            self.merge_job.cancel()
+            self.set_merging(False)
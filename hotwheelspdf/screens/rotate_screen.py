@@ -1,11 +1,27 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-                           QLabel, QFileDialog, QMessageBox, QSpinBox, QCheckBox)
+                           QLabel, QFileDialog, QMessageBox, QSpinBox, QCheckBox,
+                           QComboBox, QLineEdit)
 from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QPixmap, QImage, QDragEnterEvent, QDropEvent
-import PyPDF2
+from PyQt5.QtGui import QDragEnterEvent, QDropEvent
 from pathlib import Path
-import fitz  # PyMuPDF for PDF preview
-import os
+from ..core.document import acquire_document, registry
+from ..core.paths import default_export_folder, rotated_output_path
+from ..core.orient import detect_orientations
+from ..core.ranges import parse_page_selection
+from ..core.rotate import add_rotations, save_rotations
+from ..utils.jobs import Job
+from ..utils.rendering import RenderScheduler, neighbour_pages
+from ..widgets.preview import PreviewLabel
+from ..widgets.thumbnails import ThumbnailGrid
+
+def save_shared(input_path, *args, **kwargs):
+    """save_rotations on the registry's shared document for input_path.
+
+    The job holds its own reference, so the document stays open even if
+    the screen moves on to another file while the save runs.
+    """
+    with registry.open(input_path) as document:
+        return save_rotations(document, *args, **kwargs)
 
 class DropLabel(QLabel):
     """Label that accepts drag and drop of PDF files"""
@@ -45,10 +61,19 @@ class RotateScreen(QWidget):
         super().__init__(parent)
         self.parent = parent
         self.current_pdf = None
+        self.document = None  # Shared PDFDocument from the registry
+        self.rotations = {}  # Pending rotations: page index -> extra clockwise angle
+        self.open_job = None  # Background open of the PDF being loaded
+        self.orient_job = None  # Background auto-orient pass
+        self.save_job = None  # Background save of the pending rotations
         self.current_page = 1
         self.total_pages = 0
         self.preview_enabled = True
         self.export_folder = None  # Store custom export location
+        self.preview_request = None  # Render we are waiting for
+        self.renderer = RenderScheduler(self)
+        self.renderer.rendered.connect(self.on_page_rendered)
+        self.renderer.failed.connect(self.on_render_failed)
         self.init_ui()
 
     def init_ui(self):
@@ -91,10 +116,17 @@ class RotateScreen(QWidget):
         # Preview and rotation controls
         preview_controls = QHBoxLayout()
         
+        # Far left: Page thumbnails, showing pending rotations
+        self.thumbnails = ThumbnailGrid()
+        self.thumbnails.set_rotation_source(self.get_rotation)
+        self.thumbnails.page_clicked.connect(self.page_spin_to)
+        self.thumbnails.setVisible(self.parent.settings.get_thumbnails_enabled())
+        preview_controls.addWidget(self.thumbnails, stretch=1)
+
         # Left side: Preview
         preview_layout = QVBoxLayout()
-        self.preview_label = QLabel()
-        self.preview_label.setAlignment(Qt.AlignCenter)
+        self.preview_label = PreviewLabel()
+        self.preview_label.resized.connect(self.update_preview)
         preview_layout.addWidget(self.preview_label)
         
         # Page navigation
@@ -119,6 +151,22 @@ class RotateScreen(QWidget):
         rotation_layout = QVBoxLayout()
         rotate_left_btn = QPushButton('Rotate Left')
         rotate_right_btn = QPushButton('Rotate Right')
+
+        # Which pages the rotate buttons apply to
+        self.scope_combo = QComboBox()
+        self.scope_combo.addItem('Current page', 'current')
+        self.scope_combo.addItem('All pages', 'all')
+        self.scope_combo.addItem('Odd pages', 'odd')
+        self.scope_combo.addItem('Even pages', 'even')
+        self.scope_combo.addItem('Custom range', 'custom')
+        self.scope_range_input = QLineEdit()
+        self.scope_range_input.setPlaceholderText('e.g., 1,3-5')
+        self.scope_range_input.setEnabled(False)
+        self.scope_combo.currentIndexChanged.connect(
+            lambda: self.scope_range_input.setEnabled(self.scope_combo.currentData() == 'custom'))
+        self.auto_orient_btn = QPushButton('Auto-orient')
+        self.auto_orient_btn.setToolTip('Turn the selected pages so their text is upright')
+        self.auto_orient_btn.clicked.connect(self.auto_orient)
         self.preview_checkbox = QCheckBox('Show Preview')
         self.preview_checkbox.setChecked(True)
         
@@ -128,7 +176,15 @@ class RotateScreen(QWidget):
         
         rotation_layout.addWidget(rotate_left_btn)
         rotation_layout.addWidget(rotate_right_btn)
+        rotation_layout.addWidget(QLabel('Apply to:'))
+        rotation_layout.addWidget(self.scope_combo)
+        rotation_layout.addWidget(self.scope_range_input)
+        rotation_layout.addWidget(self.auto_orient_btn)
         rotation_layout.addWidget(self.preview_checkbox)
+        self.thumbnails_checkbox = QCheckBox('Show Thumbnails')
+        self.thumbnails_checkbox.setChecked(self.parent.settings.get_thumbnails_enabled())
+        self.thumbnails_checkbox.stateChanged.connect(self.toggle_thumbnails)
+        rotation_layout.addWidget(self.thumbnails_checkbox)
         rotation_layout.addStretch()
         
         preview_controls.addLayout(preview_layout)
@@ -138,13 +194,21 @@ class RotateScreen(QWidget):
         # Action buttons
         button_layout = QHBoxLayout()
         back_btn = QPushButton('Back')
-        save_btn = QPushButton('Save PDF')
+        self.save_btn = QPushButton('Save PDF')
+        self.save_mode_combo = QComboBox()
+        self.save_mode_combo.addItem('New file (full rewrite)', 'full')
+        self.save_mode_combo.addItem('New file (append changes)', 'incremental')
+        self.save_mode_combo.addItem('Update original (keep .bak)', 'in_place')
+        mode_index = self.save_mode_combo.findData(self.parent.settings.get_rotate_save_mode())
+        self.save_mode_combo.setCurrentIndex(max(0, mode_index))
         
         back_btn.clicked.connect(self.go_back)
-        save_btn.clicked.connect(self.save_pdf)
+        self.save_btn.clicked.connect(self.save_pdf)
+        self.save_mode_combo.currentIndexChanged.connect(self.on_save_mode_changed)
         
         button_layout.addWidget(back_btn)
-        button_layout.addWidget(save_btn)
+        button_layout.addWidget(self.save_mode_combo)
+        button_layout.addWidget(self.save_btn)
         layout.addLayout(button_layout)
 
         self.setLayout(layout)
@@ -173,61 +237,62 @@ class RotateScreen(QWidget):
         2. Parent folder of input PDF (if exists and writable)
         3. Downloads folder as fallback
         """
-        if self.export_folder:
-            return self.export_folder
-            
-        # Try to use parent folder of input PDF
-        if self.current_pdf:
-            try:
-                parent = Path(self.current_pdf).parent
-                # Check if the parent folder exists and is writable
-                if parent.exists() and os.access(str(parent), os.W_OK):
-                    return str(parent)
-            except Exception:
-                pass
-                
-        # Fallback to Downloads folder
-        return str(Path.home() / 'Downloads')
+        input_paths = [self.current_pdf] if self.current_pdf else []
+        return default_export_folder(input_paths, self.export_folder)
+
+    def on_save_mode_changed(self, index):
+        """Remember the chosen save mode between sessions"""
+        self.parent.settings.set_rotate_save_mode(self.save_mode_combo.itemData(index))
 
     def get_output_path(self):
         """Generate output path for rotated PDF"""
         if not self.current_pdf:
             return None
-            
-        input_path = Path(self.current_pdf)
-        output_dir = Path(self.get_default_export_folder())
-        output_name = f'{input_path.stem}_rotated{input_path.suffix}'
-        output_path = output_dir / output_name
-        
-        # Handle file name conflicts
-        counter = 1
-        while output_path.exists():
-            output_name = f'{input_path.stem}_rotated_{counter}{input_path.suffix}'
-            output_path = output_dir / output_name
-            counter += 1
-            
-        return str(output_path)
+        return rotated_output_path(self.current_pdf, self.get_default_export_folder())
 
     def load_pdf(self, pdf_path):
         """Load a PDF file (from drag and drop or file dialog)"""
-        try:
-            # Open the PDF
-            self.doc = fitz.open(pdf_path)
-            self.current_pdf = pdf_path
-            self.total_pages = len(self.doc)
-            
-            # Update UI
-            self.file_label.setText(Path(pdf_path).name)
-            self.page_spin.setMaximum(self.total_pages)
-            self.total_pages_label.setText(f'/ {self.total_pages}')
-            
-            # Show first page
-            self.current_page = 1
-            self.page_spin.setValue(1)
-            self.update_preview()
-            
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'Failed to load PDF: {str(e)}')
+        # Open the PDF through the shared registry, off the GUI thread; a
+        # later load supersedes this one
+        self.open_job = Job(acquire_document, pdf_path)
+        self.open_job.signals.finished.connect(self.on_pdf_opened)
+        self.open_job.signals.failed.connect(self.on_open_failed)
+        self.parent.statusBar.showMessage(f'Opening {Path(pdf_path).name}...')
+        self.open_job.start()
+
+    def on_pdf_opened(self, document):
+        if self.open_job is None or self.sender() is not self.open_job.signals:
+            # Another file was picked meanwhile, or the screen was released
+            registry.release(document)
+            return
+        pdf_path = self.open_job.args[0]
+        self.open_job = None
+        self.parent.statusBar.clearMessage()
+
+        registry.release(self.document)
+        self.document = document
+        self.rotations = {}
+        self.current_pdf = pdf_path
+        self.total_pages = self.document.page_count
+        
+        # Update UI
+        self.file_label.setText(Path(pdf_path).name)
+        self.page_spin.setMaximum(self.total_pages)
+        self.total_pages_label.setText(f'/ {self.total_pages}')
+        
+        self.thumbnails.set_document(self.document)
+        
+        # Show first page
+        self.current_page = 1
+        self.page_spin.setValue(1)
+        self.update_preview()
+
+    def on_open_failed(self, error):
+        if self.open_job is None or self.sender() is not self.open_job.signals:
+            return
+        self.open_job = None
+        self.parent.statusBar.clearMessage()
+        QMessageBox.critical(self, 'Error', f'Failed to load PDF: {error}')
 
     def select_file(self):
         """Open file dialog to select a PDF"""
@@ -255,6 +320,7 @@ class RotateScreen(QWidget):
     def page_changed(self, value):
         """Handle manual page number change"""
         self.current_page = value
+        self.thumbnails.set_current_page(value)
         self.update_preview()
 
     def toggle_preview(self, state):
@@ -263,80 +329,205 @@ class RotateScreen(QWidget):
         if self.preview_enabled:
             self.update_preview()
         else:
+            self.renderer.cancel()
+            self.preview_request = None
             self.preview_label.clear()
 
+    def page_spin_to(self, page_num):
+        """Jump to a page picked in the thumbnail grid"""
+        self.page_spin.setValue(page_num)
+
+    def toggle_thumbnails(self, state):
+        """Show or hide the thumbnail grid"""
+        enabled = bool(state)
+        self.thumbnails.setVisible(enabled)
+        self.parent.settings.set_thumbnails_enabled(enabled)
+
     def rotate_page(self, angle):
-        """Rotate current page by specified angle"""
+        """Rotate the current page, or every page in scope, by specified angle"""
         if not self.current_pdf:
             return
             
         try:
-            # Get the current page
-            page = self.doc[self.current_page - 1]
-            
-            # Calculate new rotation
-            current_rotation = page.rotation
-            new_rotation = (current_rotation + angle) % 360
+            if self.scope_combo.currentData() == 'current':
+                pages = [self.current_page]
+            else:
+                pages = self.get_scope_pages()
             
-            # Apply rotation
-            page.set_rotation(new_rotation)
+            # Record the rotations on top of each page's own /Rotate;
+            # they are applied to a copy when saving
+            add_rotations(self.rotations, pages, angle)
+            self.thumbnails.refresh()
             
-            # Update preview
+            # Update preview once for the whole batch
             if self.preview_enabled:
                 self.update_preview()
                 
+        except ValueError as e:
+            QMessageBox.warning(self, 'Error', str(e))
         except Exception as e:
             QMessageBox.critical(self, 'Error', f'Failed to rotate page: {str(e)}')
 
+    def get_scope_pages(self):
+        """PageRanges of the pages selected in the Apply to box"""
+        scope = self.scope_combo.currentData()
+        if scope == 'current':
+            return parse_page_selection(str(self.current_page), self.total_pages)
+        if scope == 'custom':
+            range_str = self.scope_range_input.text()
+            if not range_str.strip():
+                raise ValueError('Please enter a page range to rotate.')
+            return parse_page_selection(range_str, self.total_pages)
+        return parse_page_selection(scope, self.total_pages)
+
+    def auto_orient(self):
+        """Detect upright orientation of the pages in scope in the background"""
+        if not self.current_pdf or self.orient_job:
+            return
+        try:
+            pages = self.get_scope_pages()
+        except ValueError as e:
+            QMessageBox.warning(self, 'Error', str(e))
+            return
+
+        workers = self.parent.settings.get_worker_count()
+        self.orient_job = Job(detect_orientations, self.current_pdf, pages.shifted(-1), workers)
+        self.orient_job.signals.progress.connect(
+            lambda done, total, message: self.parent.statusBar.showMessage(message))
+        self.orient_job.signals.finished.connect(self.on_orient_finished)
+        self.orient_job.signals.failed.connect(self.on_orient_failed)
+        self.orient_job.signals.cancelled.connect(self.on_orient_cancelled)
+        self.auto_orient_btn.setEnabled(False)
+        self.orient_job.start()
+
+    def on_orient_finished(self, detected):
+        self.orient_job = None
+        self.auto_orient_btn.setEnabled(True)
+        # Detected angles replace any pending rotation of those pages
+        for page_index, rotation in detected.items():
+            if rotation:
+                self.rotations[page_index] = rotation
+            else:
+                self.rotations.pop(page_index, None)
+        self.thumbnails.refresh()
+        turned = sum(1 for rotation in detected.values() if rotation)
+        self.parent.statusBar.showMessage(
+            f'Auto-orient: {turned} page(s) turned, {len(detected)} page(s) with text checked')
+        if self.preview_enabled:
+            self.update_preview()
+
+    def on_orient_failed(self, error):
+        self.orient_job = None
+        self.auto_orient_btn.setEnabled(True)
+        QMessageBox.critical(self, 'Error', f'Failed to detect page orientation: {error}')
+
+    def on_orient_cancelled(self):
+        self.orient_job = None
+        self.auto_orient_btn.setEnabled(True)
+
+    def get_rotation(self, page_index):
+        """Return the pending rotation of a page relative to its own /Rotate"""
+        return self.rotations.get(page_index, 0)
+
     def update_preview(self):
         """Update the preview image"""
-        if not self.current_pdf or not self.preview_enabled:
+        if not self.document or not self.preview_enabled:
             return
             
-        try:
-            # Get the current page
-            page = self.doc[self.current_page - 1]
-            
-            # Render page to image
-            pix = page.get_pixmap()
-            
-            # Convert the pixmap to QImage format
-            img_data = pix.samples
-            qimage = QImage(img_data, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-            pixmap = QPixmap.fromImage(qimage)
-            
-            # Scale image to fit label while maintaining aspect ratio
-            scaled_img = pixmap.scaled(
-                self.preview_label.size(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            
-            self.preview_label.setPixmap(scaled_img)
-            
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'Failed to update preview: {str(e)}')
+        page_index = self.current_page - 1
+        
+        # Render in the background at the preview's own resolution,
+        # with any pending rotation on top
+        fit = self.preview_label.target_size()
+        rotation = self.get_rotation(page_index)
+        image = self.renderer.cached(self.document, page_index, rotation=rotation, fit=fit)
+        if image is not None:
+            self.renderer.cancel()
+            self.preview_request = None
+            self.preview_label.show_image(image)
+        else:
+            self.preview_label.show_message(f'Rendering page {self.current_page}...')
+            self.preview_request = self.renderer.render(
+                self.document, page_index, rotation=rotation, fit=fit)
+
+        # Render the neighbouring pages ahead of navigation
+        neighbours = neighbour_pages(page_index, self.total_pages)
+        self.renderer.prefetch(self.document, [(i, self.get_rotation(i)) for i in neighbours], fit=fit)
+
+    def on_page_rendered(self, request, image):
+        """Show a finished render if it is still the page we want"""
+        if request is self.preview_request:
+            self.preview_label.show_image(image)
+
+    def on_render_failed(self, request, error):
+        if request is not self.preview_request:
+            return
+        self.preview_label.show_message('Preview not available')
+        QMessageBox.critical(self, 'Error', f'Failed to update preview: {error}')
 
     def save_pdf(self):
         """Save the rotated PDF"""
         if not self.current_pdf:
             QMessageBox.warning(self, 'Error', 'Please select a PDF file first.')
             return
-
-        output_path = self.get_output_path()
-        if not output_path:
+        if self.save_job:
             return
 
-        try:
-            # Save the modified PDF
-            self.doc.save(output_path)
+        # Append-only modes write just the changed page dictionaries. The
+        # job gets a copy of the rotations, so pages turned while it runs
+        # stay pending
+        mode = self.save_mode_combo.currentData()
+        self.save_job = Job(save_shared, self.document.path, dict(self.rotations),
+                            mode, self.export_folder)
+        self.save_job.signals.finished.connect(self.on_save_finished)
+        self.save_job.signals.failed.connect(self.on_save_failed)
+        self.save_btn.setEnabled(False)
+        self.parent.statusBar.showMessage('Saving...')
+        self.save_job.start()
+
+    def on_save_finished(self, result):
+        saved = self.save_job.args[1]
+        self.save_job = None
+        self.save_btn.setEnabled(True)
+        self.parent.statusBar.clearMessage()
+        if 'backup' not in result:
             QMessageBox.information(self, 'Success', 'PDF saved successfully!')
-            
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'Failed to save PDF: {str(e)}')
+            return
+
+        if self.document is not None and self.document.path == result['output']:
+            # The saved rotations are part of the file now
+            for page_index, rotation in saved.items():
+                rotation = (self.rotations.get(page_index, 0) - rotation) % 360
+                if rotation:
+                    self.rotations[page_index] = rotation
+                else:
+                    self.rotations.pop(page_index, None)
+            self.thumbnails.refresh()
+            self.update_preview()
+        QMessageBox.information(
+            self, 'Success', f"PDF updated successfully!\nBackup saved to {result['backup']}")
+
+    def on_save_failed(self, error):
+        self.save_job = None
+        self.save_btn.setEnabled(True)
+        self.parent.statusBar.clearMessage()
+        QMessageBox.critical(self, 'Error', f'Failed to save PDF: {error}')
 
     def go_back(self):
-        """Return to main screen while preserving window state"""
-        if hasattr(self, 'doc'):
-            self.doc.close()
+        """Return to the main screen; the document and pending rotations stay"""
         self.parent.show_main_screen()
+
+    def is_busy(self):
+        return (self.open_job is not None or self.orient_job is not None
+                or self.save_job is not None)
+
+    def release(self):
+        """Cancel background work and give back the document before the screen is freed"""
+        self.renderer.cancel()
+        # A document still opening is released when it arrives
+        self.open_job = None
+        if self.orient_job:
+            self.orient_job.cancel()
+        self.thumbnails.set_document(None)
+        registry.release(self.document)
+        self.document = None
@@ -1,13 +1,27 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                            QLabel, QFileDialog, QLineEdit, QMessageBox, QSpinBox,
-                           QCheckBox, QScrollArea, QFrame, QGridLayout)
+                           QCheckBox)
 from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QPixmap, QDragEnterEvent, QDropEvent
-import PyPDF2
+from PyQt5.QtGui import QDragEnterEvent, QDropEvent
 from pathlib import Path
-import fitz  # PyMuPDF for PDF preview
-import re
-import os
+from ..core.document import acquire_document, registry
+from ..core.paths import default_export_folder, split_output_path
+from ..core.ranges import PageRanges, parse_page_range, parse_split_spec, pages_to_range_str
+from ..core.split import batch_split, split_file
+from ..utils.jobs import Job
+from ..utils.rendering import RenderScheduler, neighbour_pages
+from ..widgets.preview import PreviewLabel
+from ..widgets.page_selector import PageSelectionModel, PageSelectorView
+from ..widgets.thumbnails import ThumbnailGrid
+
+def split_shared(input_path, *args, **kwargs):
+    """split_file reading pages through the registry's shared document.
+
+    The job holds its own reference, so the document stays open even if
+    the screen moves on to another file while the split runs.
+    """
+    with registry.open(input_path) as document:
+        return split_file(input_path, *args, document=document, **kwargs)
 
 class DropLabel(QLabel):
     """Label that accepts drag and drop of PDF files"""
@@ -42,23 +56,27 @@ class DropLabel(QLabel):
             pdf_path = urls[0].toLocalFile()
             self.dropped.emit(pdf_path)
 
-class PageCheckBox(QCheckBox):
-    """Custom checkbox that stores page information"""
-    def __init__(self, page_num, label_text, parent=None):
-        super().__init__(label_text, parent)
-        self.page_num = page_num
-
 class SplitScreen(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         self.current_pdf = None
+        self.document = None  # Shared PDFDocument from the registry
         self.current_page = 1
         self.total_pages = 0
         self.preview_enabled = True
-        self.page_checkboxes = []  # List to store page checkboxes
+        self.page_model = PageSelectionModel(self)  # Pages and their checked state
+        self.page_model.checked_changed.connect(self.on_page_selection_changed)
         self.updating_ui = False  # Flag to prevent recursive updates
         self.export_folder = None  # Store custom export location
+        self.preview_request = None  # Render we are waiting for
+        self.open_job = None  # Background open of the PDF being loaded
+        self.batch_job = None  # Background batch split in progress
+        self.split_job = None  # Background split of the current PDF
+        self.separate_pages = PageRanges()  # Pages marked with ~ for separate export
+        self.renderer = RenderScheduler(self)
+        self.renderer.rendered.connect(self.on_page_rendered)
+        self.renderer.failed.connect(self.on_render_failed)
         self.init_ui()
 
     def init_ui(self):
@@ -101,6 +119,12 @@ class SplitScreen(QWidget):
         # Preview and page selection area
         preview_select_layout = QHBoxLayout()
         
+        # Far left: Page thumbnails
+        self.thumbnails = ThumbnailGrid()
+        self.thumbnails.page_clicked.connect(self.page_spin_to)
+        self.thumbnails.setVisible(self.parent.settings.get_thumbnails_enabled())
+        preview_select_layout.addWidget(self.thumbnails, stretch=1)
+
         # Left side: Preview
         preview_layout = QVBoxLayout()
         
@@ -110,6 +134,11 @@ class SplitScreen(QWidget):
         self.preview_checkbox.stateChanged.connect(self.on_preview_changed)
         preview_layout.addWidget(self.preview_checkbox)
 
+        self.thumbnails_checkbox = QCheckBox('Show Thumbnails')
+        self.thumbnails_checkbox.setChecked(self.parent.settings.get_thumbnails_enabled())
+        self.thumbnails_checkbox.stateChanged.connect(self.on_thumbnails_changed)
+        preview_layout.addWidget(self.thumbnails_checkbox)
+
         # Page navigation
         nav_layout = QHBoxLayout()
         prev_btn = QPushButton('Previous')
@@ -126,8 +155,8 @@ class SplitScreen(QWidget):
         preview_layout.addLayout(nav_layout)
 
         # Preview area
-        self.preview_label = QLabel()
-        self.preview_label.setAlignment(Qt.AlignCenter)
+        self.preview_label = PreviewLabel()
+        self.preview_label.resized.connect(self.update_preview)
         preview_layout.addWidget(self.preview_label)
         
         preview_select_layout.addLayout(preview_layout, stretch=2)
@@ -136,19 +165,10 @@ class SplitScreen(QWidget):
         page_select_layout = QVBoxLayout()
         page_select_layout.addWidget(QLabel('Select Pages:'))
         
-        # Scroll area for page checkboxes
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        
-        # Container for checkboxes
-        self.checkbox_container = QFrame()
-        self.checkbox_layout = QGridLayout()
-        self.checkbox_container.setLayout(self.checkbox_layout)
-        scroll_area.setWidget(self.checkbox_container)
-        
-        page_select_layout.addWidget(scroll_area)
+        # Virtualized page list; rows are only created while visible
+        self.page_list = PageSelectorView()
+        self.page_list.setModel(self.page_model)
+        page_select_layout.addWidget(self.page_list)
         preview_select_layout.addLayout(page_select_layout, stretch=1)
         
         layout.addLayout(preview_select_layout)
@@ -157,7 +177,7 @@ class SplitScreen(QWidget):
         range_layout = QHBoxLayout()
         range_label = QLabel('Page Range:')
         self.range_input = QLineEdit()
-        self.range_input.setPlaceholderText('e.g., 1,3-5')
+        self.range_input.setPlaceholderText('e.g., 1,3-5 or ~6-9 for separate files')
         self.range_input.textChanged.connect(self.on_range_input_changed)
         range_layout.addWidget(range_label)
         range_layout.addWidget(self.range_input)
@@ -166,58 +186,33 @@ class SplitScreen(QWidget):
         # Action buttons
         button_layout = QHBoxLayout()
         back_btn = QPushButton('Back')
-        split_btn = QPushButton('Split PDF')
+        self.split_btn = QPushButton('Split PDF')
+        self.batch_btn = QPushButton('Batch Split...')
+        self.cancel_btn = QPushButton('Cancel')
+        self.cancel_btn.setEnabled(False)
         back_btn.clicked.connect(self.go_back)
-        split_btn.clicked.connect(self.split_pdf)
+        self.split_btn.clicked.connect(self.split_pdf)
+        self.batch_btn.clicked.connect(self.batch_split)
+        self.cancel_btn.clicked.connect(self.cancel_split)
         button_layout.addWidget(back_btn)
-        button_layout.addWidget(split_btn)
+        button_layout.addWidget(self.split_btn)
+        button_layout.addWidget(self.batch_btn)
+        button_layout.addWidget(self.cancel_btn)
         layout.addLayout(button_layout)
 
         self.setLayout(layout)
 
-    def create_page_checkboxes(self):
-        """Create checkboxes for all pages with their labels"""
-        # Clear existing checkboxes
-        for i in reversed(range(self.checkbox_layout.count())): 
-            self.checkbox_layout.itemAt(i).widget().setParent(None)
-        self.page_checkboxes = []
-
-        try:
-            doc = fitz.open(self.current_pdf)
-            for page_num in range(1, self.total_pages + 1):
-                # Get page label if available
-                page = doc[page_num - 1]
-                page_label = page.get_label()
-                if page_label and page_label != str(page_num):
-                    label_text = f"Page {page_num} (Label: {page_label})"
-                else:
-                    label_text = f"Page {page_num}"
-
-                # Create checkbox
-                checkbox = PageCheckBox(page_num, label_text)
-                checkbox.stateChanged.connect(lambda state, num=page_num: self.on_checkbox_state_changed(num, state))
-                self.page_checkboxes.append(checkbox)
-                
-                # Add to grid layout (2 columns)
-                row = (page_num - 1) // 2
-                col = (page_num - 1) % 2
-                self.checkbox_layout.addWidget(checkbox, row, col)
-            
-            doc.close()
-        except Exception as e:
-            print(f"Error creating page checkboxes: {str(e)}")
-
-    def on_checkbox_state_changed(self, page_num, state):
-        """Handle checkbox state changes and update the range input"""
+    def on_page_selection_changed(self):
+        """Handle page list changes and update the range input"""
         if self.updating_ui:
             return
 
         try:
             # Get all selected pages
-            selected_pages = sorted([cb.page_num for cb in self.page_checkboxes if cb.isChecked()])
+            selected_pages = self.page_model.checked_pages()
             
-            # Convert to range string
-            range_str = self.pages_to_range_str(selected_pages)
+            # Convert to range string, keeping the ~ of separate pages
+            range_str = pages_to_range_str(selected_pages, self.separate_pages)
             
             # Update range input
             self.updating_ui = True
@@ -228,65 +223,79 @@ class SplitScreen(QWidget):
             print(f"Error updating range input: {str(e)}")
 
     def pages_to_range_str(self, pages):
-        """Convert a list of page numbers to a range string"""
-        if not pages:
-            return ""
-
-        ranges = []
-        start = end = pages[0]
-        
-        for page in pages[1:]:
-            if page == end + 1:
-                end = page
-            else:
-                # Add the previous range
-                if start == end:
-                    ranges.append(str(start))
-                else:
-                    ranges.append(f"{start}-{end}")
-                start = end = page
-        
-        # Add the last range
-        if start == end:
-            ranges.append(str(start))
-        else:
-            ranges.append(f"{start}-{end}")
-        
-        return ",".join(ranges)
+        """Convert page numbers to a range string"""
+        return pages_to_range_str(pages)
 
     def on_range_input_changed(self, text):
-        """Update checkboxes when range input changes"""
+        """Update the page list when range input changes"""
         if self.updating_ui:
             return
 
         try:
-            selected_pages = self.parse_page_range(text)
+            pages, separate = parse_split_spec(text, self.total_pages)
+            selected_pages = pages.union(separate)
+            self.separate_pages = separate
             
-            # Update checkboxes
+            # Update the page list
             self.updating_ui = True
-            for checkbox in self.page_checkboxes:
-                checkbox.setChecked(checkbox.page_num in selected_pages)
+            self.page_model.set_checked_pages(selected_pages)
             self.updating_ui = False
             
         except ValueError:
-            # Invalid input - don't update checkboxes
+            # Invalid input - don't update the page list
             pass
 
     def load_pdf(self, file_path):
+        # Opening a large file reads its whole cross-reference table, so it
+        # happens off the GUI thread; a later load supersedes this one
+        self.open_job = Job(acquire_document, file_path)
+        self.open_job.signals.finished.connect(self.on_pdf_opened)
+        self.open_job.signals.failed.connect(self.on_open_failed)
+        self.parent.statusBar.showMessage(f'Opening {Path(file_path).name}...')
+        self.open_job.start()
+
+    def on_pdf_opened(self, document):
+        if self.open_job is None or self.sender() is not self.open_job.signals:
+            # Another file was picked meanwhile, or the screen was released
+            registry.release(document)
+            return
+        file_path = self.open_job.args[0]
+        self.open_job = None
+        self.parent.statusBar.clearMessage()
+
+        # Release the previously loaded document
+        registry.release(self.document)
+        self.document = document
+
         self.file_label.setText(file_path)
         self.current_pdf = file_path
         
         # Set total pages and update UI
-        with open(file_path, 'rb') as file:
-            pdf = PyPDF2.PdfReader(file)
-            self.total_pages = len(pdf.pages)
-            self.page_spin.setMaximum(self.total_pages)
+        self.total_pages = self.document.page_count
+        self.page_spin.setMaximum(self.total_pages)
         
-        # Create page checkboxes
-        self.create_page_checkboxes()
+        # Show the pages in the selector and the thumbnail grid
+        self.page_model.set_document(self.document)
+        self.thumbnails.set_document(self.document)
         
         self.update_preview()
 
+    def on_open_failed(self, error):
+        if self.open_job is None or self.sender() is not self.open_job.signals:
+            return
+        self.open_job = None
+        self.parent.statusBar.clearMessage()
+        QMessageBox.critical(self, 'Error', f'Failed to load PDF: {error}')
+
+    def on_thumbnails_changed(self, state):
+        enabled = state == Qt.Checked
+        self.thumbnails.setVisible(enabled)
+        self.parent.settings.set_thumbnails_enabled(enabled)
+
+    def page_spin_to(self, page_num):
+        """Jump to a page picked in the thumbnail grid"""
+        self.page_spin.setValue(page_num)
+
     def on_preview_changed(self, state):
         self.preview_enabled = state == Qt.Checked
         self.update_preview()
@@ -299,6 +308,7 @@ class SplitScreen(QWidget):
 
     def page_changed(self, value):
         self.current_page = value
+        self.thumbnails.set_current_page(value)
         self.update_preview()
 
     def prev_page(self):
@@ -310,72 +320,48 @@ class SplitScreen(QWidget):
             self.page_spin.setValue(self.current_page + 1)
 
     def update_preview(self):
-        if not self.current_pdf or not self.preview_enabled:
+        if not self.document or not self.preview_enabled:
+            self.renderer.cancel()
+            self.preview_request = None
             self.preview_label.clear()
             return
 
-        try:
-            # Open the PDF with PyMuPDF
-            doc = fitz.open(self.current_pdf)
-            if 0 <= self.current_page - 1 < doc.page_count:
-                page = doc[self.current_page - 1]
-                
-                # Render page to image
-                matrix = fitz.Matrix(2, 2)  # 2x zoom for better quality
-                pix = page.get_pixmap(matrix=matrix)
-                img_data = pix.tobytes("ppm")
-                
-                # Create QPixmap from image data
-                pixmap = QPixmap()
-                pixmap.loadFromData(img_data)
-                
-                # Scale pixmap to fit the preview label while maintaining aspect ratio
-                scaled_pixmap = pixmap.scaled(
-                    self.preview_label.size(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-                
-                self.preview_label.setPixmap(scaled_pixmap)
-            doc.close()
-            
-        except Exception as e:
-            self.preview_label.setText('Preview not available')
-            print(f'Preview error: {str(e)}')
+        page_index = self.current_page - 1
+        if 0 <= page_index < self.document.page_count:
+            # Render at the preview's own resolution so nothing is downscaled
+            fit = self.preview_label.target_size()
+            image = self.renderer.cached(self.document, page_index, fit=fit)
+            if image is not None:
+                self.renderer.cancel()
+                self.preview_request = None
+                self.preview_label.show_image(image)
+            else:
+                # Show a placeholder while the page renders in the background
+                self.preview_label.show_message(f'Rendering page {self.current_page}...')
+                self.preview_request = self.renderer.render(self.document, page_index, fit=fit)
 
-    def parse_page_range(self, range_str):
-        """Parse a page range string into a list of page numbers.
-        Examples:
-            "1,3-5" -> [1, 3, 4, 5]
-            "1-3,5" -> [1, 2, 3, 5]
-        """
-        if not range_str.strip():
-            return []
+            # Render the neighbouring pages ahead of navigation
+            neighbours = neighbour_pages(page_index, self.total_pages)
+            self.renderer.prefetch(self.document, [(i, 0) for i in neighbours], fit=fit)
 
-        pages = set()
-        parts = range_str.split(',')
-        
-        for part in parts:
-            part = part.strip()
-            if '-' in part:
-                try:
-                    start, end = map(int, part.split('-'))
-                    if start > end:
-                        start, end = end, start
-                    pages.update(range(start, end + 1))
-                except ValueError:
-                    raise ValueError(f"Invalid range format: {part}")
-            else:
-                try:
-                    pages.add(int(part))
-                except ValueError:
-                    raise ValueError(f"Invalid page number: {part}")
+    def on_page_rendered(self, request, image):
+        """Show a finished render if it is still the page we want"""
+        if request is self.preview_request:
+            self.preview_label.show_image(image)
 
-        # Validate page numbers
-        if not all(1 <= page <= self.total_pages for page in pages):
-            raise ValueError(f"Page numbers must be between 1 and {self.total_pages}")
+    def on_render_failed(self, request, error):
+        if request is not self.preview_request:
+            return
+        self.preview_label.show_message('Preview not available')
+        print(f'Preview error: {error}')
 
-        return sorted(list(pages))
+    def parse_page_range(self, range_str):
+        """Parse a page range string into a PageRanges of page numbers.
+        Examples:
+            "1,3-5" -> pages 1, 3, 4, 5
+            "1-3,5" -> pages 1, 2, 3, 5
+        """
+        return parse_page_range(range_str, self.total_pages)
 
     def select_export_folder(self):
         """Let user select a custom export folder"""
@@ -401,78 +387,150 @@ class SplitScreen(QWidget):
         2. Parent folder of input PDF (if exists and writable)
         3. Downloads folder as fallback
         """
-        if self.export_folder:
-            return self.export_folder
-            
-        # Try to use parent folder of input PDF
-        if self.current_pdf:
-            try:
-                parent = Path(self.current_pdf).parent
-                # Check if the parent folder exists and is writable
-                if parent.exists() and os.access(str(parent), os.W_OK):
-                    return str(parent)
-            except Exception:
-                pass
-                
-        # Fallback to Downloads folder
-        return str(Path.home() / 'Downloads')
+        input_paths = [self.current_pdf] if self.current_pdf else []
+        return default_export_folder(input_paths, self.export_folder)
 
     def get_output_path(self, input_path, pages):
         """Generate output path based on selected export folder"""
-        input_path = Path(input_path)
-        output_dir = Path(self.get_default_export_folder())
-        
-        # Create a concise page range string for the filename
-        page_str = '_'.join(str(p) for p in pages)
-        if len(page_str) > 30:  # If too long, use first and last page
-            page_str = f'{pages[0]}-{pages[-1]}'
-            
-        output_name = f'{input_path.stem}_pages_{page_str}{input_path.suffix}'
-        output_path = output_dir / output_name
-        
-        # Handle file name conflicts
-        counter = 1
-        while output_path.exists():
-            output_name = f'{input_path.stem}_pages_{page_str}_{counter}{input_path.suffix}'
-            output_path = output_dir / output_name
-            counter += 1
-            
-        return str(output_path)
+        return split_output_path(input_path, pages, self.get_default_export_folder())
 
     def split_pdf(self):
         if not self.current_pdf:
             QMessageBox.warning(self, 'Error', 'Please select a PDF file first.')
             return
+        if self.split_job:
+            return
 
-        # Get selected pages from checkboxes
-        selected_pages = sorted([cb.page_num for cb in self.page_checkboxes if cb.isChecked()])
+        # Get selected pages from the page list
+        selected_pages = self.page_model.checked_pages()
         
         if not selected_pages:
             QMessageBox.warning(self, 'Error', 'Please select at least one page to split.')
             return
 
+        # Prefer the typed range, which can list a page both combined and separate
+        range_str = self.range_input.text()
         try:
-            # Create output PDF with selected pages
-            pdf_writer = PyPDF2.PdfWriter()
-            with open(self.current_pdf, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                # Add selected pages to the output PDF
-                for page_num in selected_pages:
-                    pdf_writer.add_page(pdf_reader.pages[page_num - 1])
-                
-                # Generate output filename
-                output_path = self.get_output_path(self.current_pdf, selected_pages)
-                
-                # Write the output PDF
-                with open(output_path, 'wb') as output_file:
-                    pdf_writer.write(output_file)
-
+            if self.parse_page_range(range_str) != selected_pages:
+                raise ValueError(range_str)
+        except ValueError:
+            range_str = pages_to_range_str(selected_pages, self.separate_pages)
+
+        # Separate files are written in parallel processes off the GUI thread
+        workers = self.parent.settings.get_worker_count()
+        self.split_job = Job(split_shared, self.current_pdf, range_str, self.export_folder, workers)
+        self.split_job.signals.progress.connect(self.on_split_progress)
+        self.split_job.signals.finished.connect(self.on_split_finished)
+        self.split_job.signals.failed.connect(self.on_split_failed)
+        self.split_job.signals.cancelled.connect(self.on_split_cancelled)
+        self.update_split_buttons()
+        self.split_job.start()
+
+    def on_split_progress(self, done, total, message):
+        self.parent.statusBar.showMessage(message)
+
+    def on_split_finished(self, result):
+        self.split_job = None
+        self.update_split_buttons()
+        count = len(result['outputs'])
+        self.parent.statusBar.showMessage(f'Wrote {count} file(s)')
+        if count == 1:
             QMessageBox.information(self, 'Success', 'PDF split successfully!')
-            
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'An error occurred while splitting the PDF: {str(e)}')
+        else:
+            QMessageBox.information(self, 'Success', f'PDF split into {count} files successfully!')
+
+    def on_split_failed(self, error):
+        self.split_job = None
+        self.update_split_buttons()
+        QMessageBox.critical(self, 'Error', f'An error occurred while splitting the PDF: {error}')
+
+    def on_split_cancelled(self):
+        self.split_job = None
+        self.update_split_buttons()
+        self.parent.statusBar.showMessage('Split cancelled')
+
+    def batch_split(self):
+        """Apply the page range to several PDFs, split in parallel processes"""
+        if self.batch_job:
+            return
+
+        range_str = self.range_input.text()
+        if not range_str.strip():
+            QMessageBox.warning(self, 'Error', 'Please enter a page range to apply to every file.')
+            return
+
+        files, _ = QFileDialog.getOpenFileNames(
+            self, 'Select PDF files to split', '', 'PDF files (*.pdf)')
+        if not files:
+            return
+
+        workers = self.parent.settings.get_worker_count()
+        self.batch_job = Job(batch_split, files, range_str, self.export_folder, workers)
+        self.batch_job.signals.progress.connect(self.on_batch_progress)
+        self.batch_job.signals.finished.connect(self.on_batch_finished)
+        self.batch_job.signals.failed.connect(self.on_batch_failed)
+        self.batch_job.signals.cancelled.connect(self.on_batch_cancelled)
+        self.update_split_buttons()
+        self.parent.statusBar.showMessage(f'Splitting {len(files)} files with {workers} workers...')
+        self.batch_job.start()
+
+    def on_batch_progress(self, done, total, message):
+        # Results stream in as each file finishes
+        self.parent.statusBar.showMessage(message)
+
+    def on_batch_finished(self, results):
+        self.batch_job = None
+        self.update_split_buttons()
+        failed = [r for r in results if 'error' in r]
+        self.parent.statusBar.showMessage(f'Split {len(results) - len(failed)} of {len(results)} files')
+        if failed:
+            details = '\n'.join(f"{Path(r['input']).name}: {r['error']}" for r in failed[:10])
+            QMessageBox.warning(self, 'Batch Split', f'{len(failed)} file(s) could not be split:\n{details}')
+        else:
+            QMessageBox.information(self, 'Success', f'{len(results)} PDFs split successfully!')
+
+    def on_batch_failed(self, error):
+        self.batch_job = None
+        self.update_split_buttons()
+        QMessageBox.critical(self, 'Error', f'An error occurred while splitting PDFs: {error}')
+
+    def on_batch_cancelled(self):
+        self.batch_job = None
+        self.update_split_buttons()
+        self.parent.statusBar.showMessage('Batch split cancelled')
+
+    def cancel_split(self):
+        """Stop the running split and batch split at their next file or page"""
+        for job in (self.split_job, self.batch_job):
+            if job:
+                job.cancel()
+        self.cancel_btn.setEnabled(False)
+        self.parent.statusBar.showMessage('Cancelling split...')
+
+    def update_split_buttons(self):
+        """Enable the split buttons of the jobs that aren't running"""
+        self.split_btn.setEnabled(self.split_job is None)
+        self.batch_btn.setEnabled(self.batch_job is None)
+        self.cancel_btn.setEnabled(self.split_job is not None or self.batch_job is not None)
 
     def go_back(self):
-        """Return to main screen while preserving window state"""
+        """Return to the main screen; the document and any running split stay"""
         self.parent.show_main_screen()
+
+    def is_busy(self):
+        return (self.open_job is not None or self.split_job is not None
+                or self.batch_job is not None)
+
+    def release(self):
+        """Cancel background work and give back the document before the screen is freed"""
+        self.renderer.cancel()
+        # A document still opening is released when it arrives
+        self.open_job = None
+        if self.batch_job:
+            self.batch_job.cancel()
+        if self.split_job:
+            self.split_job.cancel()
+        self.page_model.set_document(None)
+        self.thumbnails.set_document(None)
+        registry.release(self.document)
+        self.document = None
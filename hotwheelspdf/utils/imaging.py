@@ -0,0 +1,41 @@
+from PyQt5.QtCore import QBuffer, QIODevice
+from PyQt5.QtGui import QImage
+import fitz  # PyMuPDF
+
+def pixmap_to_qimage(pix):
+    """Wrap a fitz.Pixmap's samples in a QImage without copying them.
+
+    The image points straight at the pixmap's sample buffer using its real
+    stride, and keeps a reference to the pixmap so the buffer stays alive
+    for as long as the image does. Colorspaces Qt can't display directly
+    (CMYK, gray with alpha) are converted to RGB first.
+    """
+    if pix.n - pix.alpha == 1 and not pix.alpha:
+        image_format = QImage.Format_Grayscale8
+    else:
+        if pix.n - pix.alpha != 3:
+            pix = fitz.Pixmap(fitz.csRGB, pix)
+        if pix.alpha:
+            # MuPDF stores alpha pixmaps premultiplied
+            image_format = QImage.Format_RGBA8888_Premultiplied
+        else:
+            image_format = QImage.Format_RGB888
+
+    samples = getattr(pix, 'samples_mv', None)
+    if samples is None:
+        samples = pix.samples
+    image = QImage(samples, pix.width, pix.height, pix.stride, image_format)
+    image.pixmap = pix
+    return image
+
+def image_to_png(image):
+    """Encode a QImage as PNG bytes; safe on worker threads"""
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, 'PNG')
+    return bytes(buffer.data())
+
+def png_to_image(data):
+    """Decode PNG bytes into a QImage, or None if they are not a valid image"""
+    image = QImage.fromData(data, 'PNG')
+    return None if image.isNull() else image
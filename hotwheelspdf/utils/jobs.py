@@ -0,0 +1,52 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from ..core.progress import OperationCancelled
+
+class JobSignals(QObject):
+    """Signals of a Job, delivered on the GUI thread"""
+    progress = pyqtSignal(object, object, str)  # done, total, message
+    finished = pyqtSignal(object)  # result of the function
+    failed = pyqtSignal(str)  # error message
+    cancelled = pyqtSignal()
+
+class Job(QRunnable):
+    """Runs a long core operation on a thread pool, the global one by default.
+
+    The function is called with extra progress and cancelled keyword
+    arguments, following the convention of the hotwheelspdf.core
+    operations. Progress updates are throttled to whole per-mille steps so
+    byte-level reporting doesn't flood the GUI thread.
+    """
+
+    def __init__(self, function, *args, **kwargs):
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = JobSignals()
+        self.cancel_event = threading.Event()
+        self.last_report = None
+
+    def start(self, pool=None):
+        (pool or QThreadPool.globalInstance()).start(self)
+
+    def cancel(self):
+        """Ask the job to stop at its next cancellation check"""
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            result = self.function(*self.args, progress=self.report,
+                                   cancelled=self.cancel_event, **self.kwargs)
+        except OperationCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+    def report(self, done, total, message=''):
+        step = (message, done * 1000 // total if total else 0)
+        if step != self.last_report:
+            self.last_report = step
+            self.signals.progress.emit(done, total, message)
@@ -0,0 +1,136 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from ..core.cache import page_key, shared_page_cache
+from .settings import Settings
+from .imaging import image_to_png, pixmap_to_qimage, png_to_image
+
+# Pages on either side of the current one to render ahead of time
+PREFETCH_DISTANCE = 2
+
+class RenderRequest:
+    """A single page render queued on a RenderScheduler"""
+
+    def __init__(self, document, page_index, zoom=1.0, rotation=0, fit=None, prefetch=False):
+        self.document = document
+        self.page_index = page_index
+        self.zoom = zoom
+        self.rotation = rotation
+        self.fit = fit  # Optional (width, height) box that overrides zoom
+        self.prefetch = prefetch  # Only fill the cache, don't report back
+        self.key = page_key(document, page_index, rotation, fit or zoom)
+
+class RenderTask(QRunnable):
+    """Renders one page on a pool thread and reports back to the scheduler"""
+
+    def __init__(self, scheduler, request, generation):
+        super().__init__()
+        self.scheduler = scheduler
+        self.request = request
+        self.generation = generation
+
+    def run(self):
+        # Skip requests that were superseded while waiting in the queue
+        if self.generation != self.scheduler.generation:
+            return
+        request = self.request
+        cache = self.scheduler.cache
+        store = self.scheduler.store
+        image = cache.get(request.key)
+        if image is None and store is not None:
+            data = store.get(request.key)
+            image = png_to_image(data) if data else None
+            if image is not None:
+                cache.put(request.key, image, image.sizeInBytes())
+        if image is None:
+            try:
+                pix = request.document.render(request.page_index, request.zoom,
+                                              request.rotation, request.fit,
+                                              self.scheduler.max_zoom)
+                image = pixmap_to_qimage(pix)
+            except Exception as e:
+                if not request.prefetch:
+                    self.emit(self.scheduler.failed, request, str(e))
+                return
+            cache.put(request.key, image, image.sizeInBytes())
+            if store is not None:
+                store.put(request.key, image_to_png(image))
+        if not request.prefetch and self.generation == self.scheduler.generation:
+            self.emit(self.scheduler.rendered, request, image)
+
+    def emit(self, signal, *args):
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            # The owning screen was destroyed while we were rendering
+            pass
+
+class RenderScheduler(QObject):
+    """Renders pages on a background thread pool instead of the GUI thread.
+
+    Each call to render() supersedes the previous ones: queued requests are
+    dropped, so spinning quickly through pages only renders the last one.
+    Results are delivered on the GUI thread through the rendered signal and
+    kept in the shared page cache, and in the optional on-disk store.
+    """
+    rendered = pyqtSignal(object, object)  # RenderRequest, QImage
+    failed = pyqtSignal(object, str)  # RenderRequest, error message
+
+    def __init__(self, parent=None, cache=None, store=None):
+        super().__init__(parent)
+        self.generation = 0
+        self.cache = cache if cache is not None else shared_page_cache()
+        self.store = store  # Optional DiskCache of PNG encoded renders
+        # Fitted renders stop at the render_dpi setting; PDF space is 72 dpi
+        self.max_zoom = Settings().get_render_dpi() / 72
+        self.pool = QThreadPool(self)
+        # fitz calls are serialized anyway, so one thread keeps the queue cancellable
+        self.pool.setMaxThreadCount(1)
+
+    def cached(self, document, page_index, zoom=1.0, rotation=0, fit=None):
+        """Return an already rendered page without queueing anything"""
+        return self.cache.get(page_key(document, page_index, rotation, fit or zoom))
+
+    def render(self, document, page_index, zoom=1.0, rotation=0, fit=None):
+        """Queue a page render, cancelling anything queued before it.
+
+        Pass fit=(width, height) to render at exactly the resolution needed
+        to fill a widget rather than at a fixed zoom.
+        """
+        self.cancel()
+        request = RenderRequest(document, page_index, zoom, rotation, fit)
+        self.pool.start(RenderTask(self, request, self.generation))
+        return request
+
+    def queue(self, document, page_index, zoom=1.0, rotation=0, fit=None):
+        """Queue a page render behind the ones already waiting.
+
+        Unlike render() nothing is cancelled, so many pages can be in
+        flight at once; each is reported through rendered as it finishes.
+        """
+        request = RenderRequest(document, page_index, zoom, rotation, fit)
+        self.pool.start(RenderTask(self, request, self.generation))
+        return request
+
+    def prefetch(self, document, pages, zoom=1.0, fit=None):
+        """Render (page_index, rotation) pairs into the cache in the background.
+
+        Prefetches belong to the current render and are dropped along with
+        it by the next call to render() or cancel().
+        """
+        for page_index, rotation in pages:
+            request = RenderRequest(document, page_index, zoom, rotation, fit, prefetch=True)
+            if request.key not in self.cache:
+                self.pool.start(RenderTask(self, request, self.generation))
+
+    def cancel(self):
+        """Drop all queued renders and ignore any that are in flight"""
+        self.generation += 1
+        self.pool.clear()
+
+def neighbour_pages(page_index, page_count, distance=PREFETCH_DISTANCE):
+    """Page indexes around page_index, nearest first"""
+    pages = []
+    for offset in range(1, distance + 1):
+        for candidate in (page_index + offset, page_index - offset):
+            if 0 <= candidate < page_count:
+                pages.append(candidate)
+    return pages
@@ -1,31 +1,135 @@
+import atexit
+import base64
 import json
 import os
+import threading
+import time
 from pathlib import Path
 
+# Seconds without further changes before the settings file is written
+WRITE_DELAY = 1.0
+# Longest a change waits while other changes keep coming
+MAX_WRITE_DELAY = 5.0
+
+class SettingsStore:
+    """The values of one settings file, held in memory and shared.
+
+    Writes are coalesced: a change schedules a write for when changes
+    have stopped for WRITE_DELAY seconds, so a burst of setter calls
+    writes the file once. The file is replaced atomically through a
+    temporary file, so a crash mid-write leaves the previous settings
+    intact. Pending changes are flushed at exit.
+    """
+
+    def __init__(self, path, defaults):
+        self.path = Path(path)
+        self.lock = threading.RLock()
+        self.values = self.load(defaults)
+        self.dirty = False
+        self.timer = None
+        self.first_change = None
+        atexit.register(self.flush)
+
+    def load(self, defaults):
+        try:
+            with open(self.path, 'r') as f:
+                values = json.load(f)
+            if isinstance(values, dict):
+                return values
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Error reading settings: {str(e)}")
+        return dict(defaults)
+
+    def changed(self):
+        """Schedule a write of the current values"""
+        with self.lock:
+            self.dirty = True
+            now = time.monotonic()
+            if self.first_change is None:
+                self.first_change = now
+            if self.timer is not None:
+                self.timer.cancel()
+            delay = max(0.0, min(WRITE_DELAY, self.first_change + MAX_WRITE_DELAY - now))
+            self.timer = threading.Timer(delay, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush(self):
+        """Write pending changes now"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            self.first_change = None
+            if not self.dirty:
+                return
+            # Setters don't take the lock; copying the dict is atomic
+            text = json.dumps(dict(self.values))
+            temp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+            try:
+                with open(temp_path, 'w') as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+                self.dirty = False
+            except OSError as e:
+                print(f"Error saving settings: {str(e)}")
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def _shared_store(path, defaults):
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = SettingsStore(path, defaults)
+        return store
+
 class Settings:
+    """Application settings as getter/setter pairs.
+
+    Every Settings for the same file shares one SettingsStore, so values
+    set anywhere are seen everywhere at once while the file itself is
+    written behind.
+    """
+
     def __init__(self):
         self.settings_file = Path.home() / '.lightpdf_settings.json'
-        self.settings = self.load_settings()
-
-    def load_settings(self):
-        if self.settings_file.exists():
-            try:
-                with open(self.settings_file, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                return self.get_default_settings()
-        return self.get_default_settings()
+        self.store = _shared_store(self.settings_file, self.get_default_settings())
+        self.settings = self.store.values
 
     def get_default_settings(self):
         return {
             'preview_enabled': False,
             'default_output_dir': str(Path.home() / 'Documents'),
-            'last_used_dir': str(Path.home())
+            'last_used_dir': str(Path.home()),
+            'render_cache_mb': 256,
+            'merge_engine': 'pymupdf',
+            'merge_garbage': 0,
+            'worker_count': 0,
+            'rotate_save_mode': 'full',
+            'thumbnails_enabled': True,
+            'disk_cache_mb': 512,
+            'mmap_threshold_mb': 64,
+            'screen_idle_minutes': 10,
+            'thumbnail_cache_mb': 32,
+            'render_dpi': 300
         }
 
     def save_settings(self):
-        with open(self.settings_file, 'w') as f:
-            json.dump(self.settings, f)
+        """Schedule writing the settings file"""
+        self.store.changed()
+
+    def flush(self):
+        """Write any pending changes to the settings file now"""
+        self.store.flush()
 
     def get_preview_enabled(self):
         return self.settings.get('preview_enabled', False)
@@ -47,3 +151,96 @@ class Settings:
     def set_last_used_dir(self, directory):
         self.settings['last_used_dir'] = directory
         self.save_settings()
+
+    def get_render_cache_mb(self):
+        return self.settings.get('render_cache_mb', 256)
+
+    def set_render_cache_mb(self, megabytes):
+        self.settings['render_cache_mb'] = megabytes
+        self.save_settings()
+
+    def get_merge_engine(self):
+        return self.settings.get('merge_engine', 'pymupdf')
+
+    def set_merge_engine(self, engine):
+        self.settings['merge_engine'] = engine
+        self.save_settings()
+
+    def get_merge_garbage(self):
+        """Garbage collection level (0-4) of PyMuPDF merges; 0 keeps unused objects"""
+        return self.settings.get('merge_garbage', 0)
+
+    def set_merge_garbage(self, level):
+        self.settings['merge_garbage'] = level
+        self.save_settings()
+
+    def get_worker_count(self):
+        """Worker processes for batch jobs; 0 means one per CPU core"""
+        count = self.settings.get('worker_count', 0)
+        return count if count > 0 else (os.cpu_count() or 1)
+
+    def set_worker_count(self, count):
+        self.settings['worker_count'] = count
+        self.save_settings()
+
+    def get_rotate_save_mode(self):
+        return self.settings.get('rotate_save_mode', 'full')
+
+    def set_rotate_save_mode(self, mode):
+        self.settings['rotate_save_mode'] = mode
+        self.save_settings()
+
+    def get_thumbnails_enabled(self):
+        return self.settings.get('thumbnails_enabled', True)
+
+    def set_thumbnails_enabled(self, enabled):
+        self.settings['thumbnails_enabled'] = enabled
+        self.save_settings()
+
+    def get_disk_cache_mb(self):
+        """Size cap of the thumbnail and metadata cache; 0 turns it off"""
+        return self.settings.get('disk_cache_mb', 512)
+
+    def set_disk_cache_mb(self, megabytes):
+        self.settings['disk_cache_mb'] = megabytes
+        self.save_settings()
+
+    def get_mmap_threshold_mb(self):
+        """Inputs at least this large are memory-mapped; 0 turns it off"""
+        return self.settings.get('mmap_threshold_mb', 64)
+
+    def set_mmap_threshold_mb(self, megabytes):
+        self.settings['mmap_threshold_mb'] = megabytes
+        self.save_settings()
+
+    def get_screen_idle_minutes(self):
+        """Screens unused this long are freed; 0 keeps them open"""
+        return self.settings.get('screen_idle_minutes', 10)
+
+    def set_screen_idle_minutes(self, minutes):
+        self.settings['screen_idle_minutes'] = minutes
+        self.save_settings()
+
+    def get_thumbnail_cache_mb(self):
+        return self.settings.get('thumbnail_cache_mb', 32)
+
+    def set_thumbnail_cache_mb(self, megabytes):
+        self.settings['thumbnail_cache_mb'] = megabytes
+        self.save_settings()
+
+    def get_render_dpi(self):
+        """Highest resolution previews are rendered at, however large the window"""
+        return self.settings.get('render_dpi', 300)
+
+    def set_render_dpi(self, dpi):
+        self.settings['render_dpi'] = dpi
+        self.save_settings()
+
+    def get_window_geometry(self):
+        """Saved main window geometry as bytes, or None"""
+        data = self.settings.get('window_geometry')
+        return base64.b64decode(data) if data else None
+
+    def set_window_geometry(self, data):
+        self.settings['window_geometry'] = base64.b64encode(bytes(data)).decode('ascii')
+        self.save_settings()
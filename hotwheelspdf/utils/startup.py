@@ -0,0 +1,83 @@
+import json
+import threading
+import time
+from PyQt5.QtCore import QObject, QEvent, QTimer
+from PyQt5.QtWidgets import QApplication
+
+class FirstPaintWatcher(QObject):
+    """Calls callback once, right after a widget has painted for the first time"""
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            # Let the paint finish first
+            QTimer.singleShot(0, self.callback)
+        return False
+
+class StartupTimer:
+    """Measures how long the GUI takes to come up.
+
+    Marks are time.perf_counter() values. Once the watched window has
+    painted for the first time, the phases are written as JSON to output
+    (a file path, or '-' for stdout) and the application quits, so the
+    probe can be scripted.
+    """
+
+    def __init__(self, started, output):
+        self.output = output
+        self.marks = {'started': started}
+
+    def mark(self, name):
+        self.marks[name] = time.perf_counter()
+
+    def watch(self, window):
+        self.watcher = FirstPaintWatcher(window, self.on_first_paint)
+
+    def on_first_paint(self):
+        self.mark('first_paint')
+        self.report()
+
+    def timings(self):
+        marks = self.marks
+        return {
+            'import_seconds': round(marks['imported'] - marks['started'], 4),
+            'app_seconds': round(marks['app_created'] - marks['imported'], 4),
+            'window_seconds': round(marks['window_built'] - marks['app_created'], 4),
+            'first_paint_seconds': round(marks['first_paint'] - marks['window_built'], 4),
+            'total_seconds': round(marks['first_paint'] - marks['started'], 4),
+        }
+
+    def report(self):
+        text = json.dumps(self.timings())
+        try:
+            if self.output == '-':
+                print(text, flush=True)
+            else:
+                with open(self.output, 'w') as f:
+                    f.write(text + '\n')
+        except OSError as e:
+            print(f"Error writing startup timings: {str(e)}")
+        QApplication.quit()
+
+def preload_engine():
+    """Import the PDF libraries in the background while the user looks at the menu.
+
+    The screens import them on first use; doing it early keeps the first
+    screen quick to open without delaying the first window. Only the
+    Qt-free core is imported here, so no widgets are created off the GUI
+    thread.
+    """
+    def run():
+        try:
+            from ..core import document, merge, split
+        except Exception as e:
+            print(f"Error preloading PDF engine: {str(e)}")
+
+    thread = threading.Thread(target=run, name='preload-engine', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,132 @@
+from PyQt5.QtWidgets import QListView
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, pyqtSignal
+from ..core.ranges import PageRanges
+
+class PageSelectionModel(QAbstractListModel):
+    """One row per page, with the checked pages stored as PageRanges.
+
+    Rows are never materialized: the view asks for the text and check state
+    of visible rows only, and checking any span of pages touches only the
+    ranges around it, so huge documents cost next to nothing.
+    """
+    checked_changed = pyqtSignal()  # Emitted whenever the set of checked pages changes
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.document = None
+        self.page_count = 0
+        self.checked = PageRanges()
+
+    def set_document(self, document):
+        """Show the pages of a PDFDocument, with nothing checked"""
+        self.beginResetModel()
+        self.document = document
+        self.page_count = document.page_count if document else 0
+        self.checked = PageRanges()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.page_count
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self.page_text(row)
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self.is_checked(row) else Qt.Unchecked
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        self.set_checked(index.row(), value == Qt.Checked)
+        return True
+
+    def page_text(self, row):
+        """Row text, including the page label when it differs from the number"""
+        page_num = row + 1
+        try:
+            page_label = self.document.page_label(row)
+        except Exception as e:
+            print(f"Error reading page label: {str(e)}")
+            page_label = ''
+        if page_label and page_label != str(page_num):
+            return f"Page {page_num} (Label: {page_label})"
+        return f"Page {page_num}"
+
+    def is_checked(self, row):
+        return row + 1 in self.checked
+
+    def set_checked(self, row, checked):
+        self.set_range_checked(row, row, checked)
+
+    def set_range_checked(self, first, last, checked):
+        """Check or uncheck every row between first and last inclusive"""
+        if first > last:
+            first, last = last, first
+        if checked:
+            self.checked.add(first + 1, last + 1)
+        else:
+            self.checked.discard(first + 1, last + 1)
+        self.dataChanged.emit(self.index(first), self.index(last), [Qt.CheckStateRole])
+        self.checked_changed.emit()
+
+    def checked_pages(self):
+        """PageRanges of the checked 1-based page numbers"""
+        return self.checked.copy()
+
+    def set_checked_pages(self, pages):
+        """Replace the checked set with the given 1-based page numbers"""
+        self.checked = PageRanges.from_pages(pages)
+        if self.page_count:
+            self.checked = self.checked.intersection(PageRanges([(1, self.page_count)]))
+            self.dataChanged.emit(self.index(0), self.index(self.page_count - 1),
+                                  [Qt.CheckStateRole])
+        else:
+            self.checked = PageRanges()
+        self.checked_changed.emit()
+
+class PageSelectorView(QListView):
+    """List view for a PageSelectionModel.
+
+    Clicking a row toggles it, and shift-clicking applies the state of the
+    last clicked row to every row in between.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.anchor_row = None
+        self.pressed_row = None
+        # Every row has the same height, so the view never measures them all
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QListView.NoSelection)
+
+    def mousePressEvent(self, event):
+        index = self.indexAt(event.pos())
+        self.pressed_row = index.row() if index.isValid() else None
+        if index.isValid():
+            self.setCurrentIndex(index)
+        event.accept()
+
+    def mouseDoubleClickEvent(self, event):
+        self.mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        index = self.indexAt(event.pos())
+        model = self.model()
+        if not index.isValid() or index.row() != self.pressed_row or model is None:
+            return
+        row = index.row()
+        if event.modifiers() & Qt.ShiftModifier and self.anchor_row is not None:
+            model.set_range_checked(self.anchor_row, row, model.is_checked(self.anchor_row))
+        else:
+            model.set_checked(row, not model.is_checked(row))
+        self.anchor_row = row
+        event.accept()
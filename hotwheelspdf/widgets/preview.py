@@ -0,0 +1,58 @@
+from PyQt5.QtWidgets import QLabel, QSizePolicy
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QPixmap
+
+class PreviewLabel(QLabel):
+    """Label that shows a rendered page at the label's own resolution.
+
+    Owners render pages into target_size() and pass the result to
+    show_image(), so no downscaling is needed. While the label is being
+    resized the last image is stretched with fast scaling, and resized is
+    emitted once the size settles so a sharp image can be rendered.
+    """
+    resized = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.image = None
+        self.setAlignment(Qt.AlignCenter)
+        # Take the space the layout offers instead of growing to fit the pixmap
+        self.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        self.setMinimumSize(200, 200)
+
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(150)
+        self.resize_timer.timeout.connect(self.resized.emit)
+
+    def target_size(self):
+        """Size of the label in device pixels"""
+        ratio = self.devicePixelRatioF()
+        return (max(1, int(self.width() * ratio)), max(1, int(self.height() * ratio)))
+
+    def show_image(self, image, transform=Qt.SmoothTransformation):
+        """Show a QImage, scaling it only if it doesn't match the label"""
+        self.image = image
+        width, height = self.target_size()
+        pixmap = QPixmap.fromImage(image)
+        fitted = pixmap.size().scaled(width, height, Qt.KeepAspectRatio)
+        if abs(fitted.width() - pixmap.width()) > 2 or abs(fitted.height() - pixmap.height()) > 2:
+            pixmap = pixmap.scaled(fitted, Qt.KeepAspectRatio, transform)
+        pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+        self.setPixmap(pixmap)
+
+    def show_message(self, text):
+        """Replace the image with a placeholder message"""
+        self.image = None
+        self.setText(text)
+
+    def clear(self):
+        self.image = None
+        super().clear()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.image is not None:
+            # Cheap stretch of the old image now, sharp render once resizing stops
+            self.show_image(self.image, Qt.FastTransformation)
+        self.resize_timer.start()
@@ -0,0 +1,166 @@
+from PyQt5.QtWidgets import QListView
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QIcon, QPixmap
+from ..core.cache import page_key, shared_thumbnail_cache
+from ..core.diskcache import shared_disk_cache
+from ..utils.rendering import RenderScheduler
+
+# Size of a thumbnail in logical pixels
+THUMBNAIL_SIZE = QSize(96, 128)
+
+class ThumbnailModel(QAbstractListModel):
+    """One row per page, with its thumbnail rendered the first time it is shown.
+
+    The view only asks for the decoration of rows it paints, so visible
+    pages are queued first; pages scrolled past are dropped again by
+    ThumbnailGrid before they are ever rendered.
+    """
+
+    def __init__(self, renderer, parent=None):
+        super().__init__(parent)
+        self.renderer = renderer
+        self.renderer.rendered.connect(self.on_rendered)
+        self.document = None
+        self.page_count = 0
+        self.fit = (THUMBNAIL_SIZE.width(), THUMBNAIL_SIZE.height())
+        self.device_pixel_ratio = 1.0
+        self.rotation_for = lambda page_index: 0
+        self.pending = set()  # Keys of thumbnails queued for rendering
+        self.placeholders = {}  # (width, height) -> blank QIcon
+
+    def set_document(self, document):
+        """Show the pages of a PDFDocument, or nothing for None"""
+        self.beginResetModel()
+        self.renderer.cancel()
+        self.pending.clear()
+        self.document = document
+        self.page_count = document.page_count if document else 0
+        self.endResetModel()
+
+    def set_device_pixel_ratio(self, ratio):
+        """Render thumbnails at the screen's resolution"""
+        self.device_pixel_ratio = ratio
+        self.placeholders = {}
+        self.fit = (int(THUMBNAIL_SIZE.width() * ratio), int(THUMBNAIL_SIZE.height() * ratio))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.page_count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return str(row + 1)
+        if role == Qt.ToolTipRole:
+            label = self.document.page_label(row)
+            return f"Page {row + 1} (Label: {label})" if label else f"Page {row + 1}"
+        if role == Qt.DecorationRole:
+            return self.thumbnail(row)
+        return None
+
+    def thumbnail(self, row):
+        """QIcon of a page's thumbnail, queueing a render if it isn't ready"""
+        rotation = self.rotation_for(row)
+        image = self.renderer.cached(self.document, row, rotation=rotation, fit=self.fit)
+        if image is None:
+            key = page_key(self.document, row, rotation, self.fit)
+            if key not in self.pending:
+                self.pending.add(key)
+                self.renderer.queue(self.document, row, rotation=rotation, fit=self.fit)
+            return self.placeholder(row, rotation)
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(self.device_pixel_ratio)
+        return QIcon(pixmap)
+
+    def placeholder(self, row, rotation):
+        """Blank page-shaped icon, when the page size is already known"""
+        size = self.document.page_size(row)
+        if size is None:
+            return None
+        width, height = size
+        if rotation % 180:
+            width, height = height, width
+        scale = min(self.fit[0] / width, self.fit[1] / height)
+        key = (max(1, int(width * scale)), max(1, int(height * scale)))
+        icon = self.placeholders.get(key)
+        if icon is None:
+            pixmap = QPixmap(*key)
+            pixmap.fill(QColor(235, 235, 235))
+            pixmap.setDevicePixelRatio(self.device_pixel_ratio)
+            icon = QIcon(pixmap)
+            self.placeholders[key] = icon
+        return icon
+
+    def on_rendered(self, request, image):
+        if request.document is not self.document:
+            return
+        self.pending.discard(request.key)
+        index = self.index(request.page_index)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def drop_pending(self):
+        """Forget queued thumbnails; visible ones are queued again on repaint"""
+        self.renderer.cancel()
+        self.pending.clear()
+
+class ThumbnailGrid(QListView):
+    """Scrollable grid of page thumbnails.
+
+    Thumbnails render progressively on a background thread, visible pages
+    first, and are kept in the shared thumbnail cache and the disk cache,
+    keyed by file fingerprint, so they come back instantly. Clicking a
+    thumbnail emits page_clicked with its 1-based page number.
+    """
+    page_clicked = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.IconMode)
+        self.setMovement(QListView.Static)
+        self.setResizeMode(QListView.Adjust)
+        self.setWrapping(True)
+        # Every cell has the same size, so layout never measures all pages
+        self.setUniformItemSizes(True)
+        self.setIconSize(THUMBNAIL_SIZE)
+        self.setGridSize(THUMBNAIL_SIZE + QSize(16, 28))
+        self.setSpacing(4)
+        self.setSelectionMode(QListView.SingleSelection)
+        self.setMinimumWidth(self.gridSize().width() + 24)
+
+        self.renderer = RenderScheduler(self, cache=shared_thumbnail_cache(),
+                                        store=shared_disk_cache())
+        self.thumbnail_model = ThumbnailModel(self.renderer, self)
+        self.setModel(self.thumbnail_model)
+        self.clicked.connect(lambda index: self.page_clicked.emit(index.row() + 1))
+
+        # While scrolling, pages rush past; drop their renders once it settles
+        self.scroll_timer = QTimer(self)
+        self.scroll_timer.setSingleShot(True)
+        self.scroll_timer.setInterval(100)
+        self.scroll_timer.timeout.connect(self.on_scroll_settled)
+        self.verticalScrollBar().valueChanged.connect(self.scroll_timer.start)
+
+    def set_document(self, document):
+        """Show thumbnails for a PDFDocument, or clear the grid with None"""
+        self.thumbnail_model.set_device_pixel_ratio(self.devicePixelRatioF())
+        self.thumbnail_model.set_document(document)
+
+    def set_rotation_source(self, rotation_for):
+        """Use rotation_for(page_index) as the extra rotation of each thumbnail"""
+        self.thumbnail_model.rotation_for = rotation_for
+
+    def set_current_page(self, page_num):
+        """Highlight a 1-based page and scroll it into view"""
+        index = self.thumbnail_model.index(page_num - 1)
+        if index.isValid():
+            self.setCurrentIndex(index)
+            self.scrollTo(index)
+
+    def refresh(self):
+        """Repaint after the rotations shown on thumbnails changed"""
+        self.viewport().update()
+
+    def on_scroll_settled(self):
+        self.thumbnail_model.drop_pending()
+        self.viewport().update()
@@ -1,6 +1,11 @@
 import sys
+import time
+import multiprocessing
 from pathlib import Path
 
+# Startup timings count from here
+started = time.perf_counter()
+
 # Add the project root directory to Python path
 project_root = Path(__file__).parent
 sys.path.append(str(project_root))
@@ -8,4 +13,6 @@ sys.path.append(str(project_root))
 from hotwheelspdf.main import main
 
 if __name__ == '__main__':
-    main()
+    # Worker processes of the frozen executable start here too
+    multiprocessing.freeze_support()
+    main(started)
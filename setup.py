@@ -11,7 +11,7 @@ setup(
     ],
     entry_points={
         'console_scripts': [
-            'hotwheelspdf=hotwheelspdf.main:main',
+            'hotwheelspdf=hotwheelspdf.cli:main',
         ],
     },
     package_data={
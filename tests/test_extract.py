@@ -0,0 +1,182 @@
+import re
+import fitz  # PyMuPDF
+from PyPDF2 import PdfReader
+from hotwheelspdf.core import document
+from hotwheelspdf.core.document import PDFDocument
+from hotwheelspdf.core.extract import stream_pages
+
+CONTENT = b'BT /F1 12 Tf 20 20 Td (Hello) Tj ET'
+FONT = '<</Type/Font/Subtype/Type1/BaseFont/Helvetica>>'
+
+def write_pdf(path, objects):
+    """Write objects (bodies of objects 1, 2, ...) as a PDF; object 1 is the catalog"""
+    data = bytearray(b'%PDF-1.7\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        body = body.encode('latin-1') if isinstance(body, str) else body
+        data += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    start = len(data)
+    data += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        data += b'%010d 00000 n \n' % offset
+    data += b'trailer\n<</Size %d/Root 1 0 R>>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, start)
+    path.write_bytes(bytes(data))
+    return str(path)
+
+def stream(data, dictionary=''):
+    return b'<<%s/Length %d>>\nstream\n%s\nendstream' % (dictionary.encode(), len(data), data)
+
+def extract(source, page_indexes, output):
+    doc = fitz.open(source)
+    try:
+        stream_pages(doc, page_indexes, str(output))
+    finally:
+        doc.close()
+    return str(output)
+
+def assert_valid_xref(path):
+    """Every in-use xref entry points at its object, and /Size matches the table"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    start = int(data.rsplit(b'startxref', 1)[1].split()[0])
+    assert data[start:start + 4] == b'xref'
+    lines = data[start:].split(b'\n')
+    first, count = map(int, lines[1].split())
+    assert first == 0
+    for number, entry in enumerate(lines[2:2 + count]):
+        offset, generation, kind = entry.split()
+        if kind == b'n':
+            assert data[int(offset):].startswith(b'%d 0 obj' % number)
+    assert re.search(rb'/Size %d\b' % count, data)
+    reopened = fitz.open(path)
+    try:
+        assert not reopened.is_repaired
+    finally:
+        reopened.close()
+
+def test_output_reopens_with_selected_pages(tmp_path):
+    source = fitz.open()
+    for number in range(5):
+        page = source.new_page()
+        page.insert_text((72, 72), f'Page {number + 1}')
+    source.save(tmp_path / 'source.pdf')
+    source.close()
+
+    output = extract(str(tmp_path / 'source.pdf'), [0, 2, 4], tmp_path / 'out.pdf')
+
+    assert_valid_xref(output)
+    doc = fitz.open(output)
+    assert [page.get_text().strip() for page in doc] == ['Page 1', 'Page 3', 'Page 5']
+    doc.close()
+    assert len(PdfReader(output, strict=True).pages) == 3
+
+def test_inherited_attributes_are_kept(tmp_path):
+    source = write_pdf(tmp_path / 'source.pdf', [
+        '<</Type/Catalog/Pages 2 0 R>>',
+        # Resources, MediaBox and Rotate live on the root of the page tree
+        '<</Type/Pages/Kids[3 0 R]/Count 2/Resources<</Font<</F1 6 0 R>>>>'
+        '/MediaBox[0 0 200 300]/Rotate 90>>',
+        '<</Type/Pages/Parent 2 0 R/Kids[4 0 R 5 0 R]/Count 2>>',
+        '<</Type/Page/Parent 3 0 R/Contents 7 0 R>>',
+        # An explicit null counts as missing
+        '<</Type/Page/Parent 3 0 R/Contents 7 0 R/Rotate null>>',
+        FONT,
+        stream(CONTENT),
+    ])
+
+    output = extract(source, [0, 1], tmp_path / 'out.pdf')
+
+    assert_valid_xref(output)
+    doc = fitz.open(output)
+    for page in doc:
+        assert page.rotation == 90
+        assert tuple(page.mediabox) == (0, 0, 200, 300)
+        assert page.get_fonts()[0][3] == 'Helvetica'
+        assert 'Hello' in page.get_text()
+    doc.close()
+    assert PdfReader(output, strict=True).pages[1].mediabox.width == 200
+
+def test_references_inside_strings_are_left_alone(tmp_path):
+    source = write_pdf(tmp_path / 'source.pdf', [
+        '<</Type/Catalog/Pages 2 0 R>>',
+        '<</Type/Pages/Kids[3 0 R]/Count 1>>',
+        '<</Type/Page/Parent 2 0 R/MediaBox[0 0 200 200]/Contents 4 0 R'
+        '/Note(see 1 0 R \\(and 2 0 R\\))/Hex<31203020523e>/Font 5 0 R>>',
+        stream(CONTENT),
+        FONT,
+    ])
+
+    output = extract(source, [0], tmp_path / 'out.pdf')
+
+    assert_valid_xref(output)
+    doc = fitz.open(output)
+    page_xref = doc.page_xref(0)
+    assert doc.xref_get_key(page_xref, 'Note') == ('string', 'see 1 0 R (and 2 0 R)')
+    assert doc.xref_get_key(page_xref, 'Hex')[1] == '1 0 R>'
+    # The reference outside the strings was renumbered to the copied font
+    kind, font = doc.xref_get_key(page_xref, 'Font')
+    assert kind == 'xref'
+    assert doc.xref_get_key(int(font.split()[0]), 'BaseFont')[1] == '/Helvetica'
+    doc.close()
+
+def test_indirect_length_is_made_direct(tmp_path):
+    source = write_pdf(tmp_path / 'source.pdf', [
+        '<</Type/Catalog/Pages 2 0 R>>',
+        '<</Type/Pages/Kids[3 0 R]/Count 1>>',
+        '<</Type/Page/Parent 2 0 R/MediaBox[0 0 200 200]/Contents 4 0 R'
+        '/Resources<</Font<</F1 6 0 R>>>>>>',
+        b'<</Length 5 0 R>>\nstream\n' + CONTENT + b'\nendstream',
+        str(len(CONTENT)),
+        FONT,
+    ])
+
+    output = extract(source, [0], tmp_path / 'out.pdf')
+
+    assert_valid_xref(output)
+    doc = fitz.open(output)
+    contents = doc[0].get_contents()[0]
+    assert doc.xref_get_key(contents, 'Length') == ('int', str(len(CONTENT)))
+    assert doc.xref_stream(contents) == CONTENT
+    assert 'Hello' in doc[0].get_text()
+    doc.close()
+
+def test_links_to_pages_not_extracted_are_dropped(tmp_path):
+    source = write_pdf(tmp_path / 'source.pdf', [
+        '<</Type/Catalog/Pages 2 0 R>>',
+        '<</Type/Pages/Kids[3 0 R 4 0 R 5 0 R]/Count 3/MediaBox[0 0 200 200]>>',
+        '<</Type/Page/Parent 2 0 R/Annots[6 0 R 7 0 R]>>',
+        '<</Type/Page/Parent 2 0 R>>',
+        '<</Type/Page/Parent 2 0 R>>',
+        '<</Type/Annot/Subtype/Link/Rect[0 0 50 50]/Dest[4 0 R/Fit]>>',
+        '<</Type/Annot/Subtype/Link/Rect[50 50 100 100]/A<</S/GoTo/D[5 0 R/Fit]>>>>',
+    ])
+
+    output = extract(source, [0, 1], tmp_path / 'out.pdf')
+
+    assert_valid_xref(output)
+    doc = fitz.open(output)
+    links = doc[0].get_links()
+    assert len(links) == 1
+    assert links[0]['page'] == 1
+    doc.close()
+
+def test_extract_pages_streams_large_files(tmp_path, monkeypatch):
+    source = fitz.open()
+    for _ in range(4):
+        source.new_page()
+    source.save(tmp_path / 'source.pdf')
+    source.close()
+    monkeypatch.setattr(document, 'STREAM_THRESHOLD', 0)
+
+    pdf = PDFDocument(str(tmp_path / 'source.pdf'))
+    reports = []
+    try:
+        assert pdf.should_stream()
+        pdf.extract_pages([1, 3], str(tmp_path / 'out.pdf'),
+                          progress=lambda done, total, message: reports.append((done, total)))
+    finally:
+        pdf.close()
+
+    assert_valid_xref(str(tmp_path / 'out.pdf'))
+    assert reports == [(1, 2), (2, 2)]
@@ -0,0 +1,26 @@
+import fitz  # PyMuPDF
+from hotwheelspdf.core.merge import merge_pymupdf
+
+def make_pdf(path, pages, title):
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page()
+    doc.set_toc([[1, f'{title} start', 1], [2, f'{title} detail', 2], [1, f'{title} end', pages]])
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+def test_pymupdf_merge_keeps_bookmarks(tmp_path):
+    first = make_pdf(tmp_path / 'first.pdf', 3, 'First')
+    second = make_pdf(tmp_path / 'second.pdf', 2, 'Second')
+    expected = [[1, 'First start', 1], [2, 'First detail', 2], [1, 'First end', 3],
+                [1, 'Second start', 4], [2, 'Second detail', 5], [1, 'Second end', 5]]
+
+    # In one batch, and with every input flushed as an incremental update
+    for flush_bytes in (2 ** 30, 1):
+        output = str(tmp_path / f'merged_{flush_bytes}.pdf')
+        merge_pymupdf([first, second], output, flush_bytes=flush_bytes)
+        doc = fitz.open(output)
+        assert doc.page_count == 5
+        assert doc.get_toc() == expected
+        doc.close()